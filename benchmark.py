@@ -0,0 +1,49 @@
+import argparse
+import json
+import os
+import sys
+
+# Benchmarks run headless, screens are drawn into SDL dummy drivers
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from classes import benchmark  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time hot paths of the game")
+    parser.add_argument(
+        "names", nargs="*", help="only run benchmarks whose name contains any of these"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", metavar="PATH", help="store results as a baseline")
+    parser.add_argument(
+        "--compare", metavar="PATH", help="compare results against a saved baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="relative slowdown reported as a regression (default 0.25)",
+    )
+    args = parser.parse_args()
+
+    results = benchmark.run(args.names, args.repeat)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=4)
+
+    if not args.compare:
+        print(benchmark.format_results(results))
+        return
+    with open(args.compare, "r", encoding="utf-8") as file:
+        baseline = json.load(file)
+    rows = benchmark.compare(results, baseline, args.threshold)
+    print(benchmark.format_comparison(rows))
+    # Non-zero exit lets scripts fail on regressions
+    if any(row[4] == "REGRESSION" for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+from collections import Counter, deque
+import random
+from classes.occupancy_grid import OccupancyGrid
+from constants.constants import (
+    EMPTY_CELL,
+    BODY_CELL,
+    FOOD_CELL,
+    ARENA_SIZE,
+    ARENA_SNAKES,
+    ARENA_FOOD,
+)
+
+DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+
+class ArenaSnake:
+    def __init__(self, snake_id, body, direction):
+        self.id = snake_id
+        # Packed cells, head first
+        self.body = deque(body)
+        self.direction = direction
+        self.growth = 0
+        self.alive = True
+        self.target_food = None
+        self.next_head = None
+
+    @property
+    def head(self):
+        return self.body[0]
+
+
+class Arena:
+    """Many snakes moving at once on one board, pygame-free like Simulation
+
+    The shared occupancy grid is the spatial index: head against any body is a
+    single cell lookup and head to head collisions are found by hashing the
+    cells claimed in a tick, so a tick costs O(snakes) instead of O(snakes²).
+    Snake 0 is the player, every other snake is steered by a simple AI.
+    """
+
+    def __init__(
+        self,
+        num_snakes=ARENA_SNAKES,
+        num_food=ARENA_FOOD,
+        size=ARENA_SIZE,
+        seed=None,
+    ):
+        self.width, self.height = size
+        self.num_snakes = num_snakes
+        self.num_food = num_food
+        self.grid = OccupancyGrid(self.width, self.height)
+        self.rng = random.Random()
+        self.snakes = []
+        # Food cells with a reverse index for O(1) removal and sampling
+        self.food_cells = []
+        self.food_slots = {}
+        self.ticks = 0
+        self.score = 0
+        self.reset(seed)
+
+    @property
+    def player(self):
+        return self.snakes[0]
+
+    @property
+    def done(self):
+        return not self.player.alive
+
+    def reset(self, seed=None):
+        self.rng.seed(seed)
+        self.grid.reset()
+        self.food_cells.clear()
+        self.food_slots.clear()
+        self.ticks = 0
+        self.score = 0
+        self.snakes = []
+        for snake_id in range(self.num_snakes):
+            snake = self.spawn(snake_id)
+            if snake is None:
+                break
+            self.snakes.append(snake)
+        self.add_food()
+
+    # Places a new snake of length 3 on free cells, None if no spot was found
+    def spawn(self, snake_id, attempts=20):
+        for _ in range(attempts):
+            head = self.grid.random_free_cell(self.rng)
+            if head is None:
+                return None
+            direction = self.rng.choice(DIRECTIONS)
+            x, y = self.grid.unpack(head)
+            if not 3 <= x < self.width - 3 or not 5 <= y < self.height - 3:
+                continue
+            body = [
+                self.grid.pack(x - direction[0] * i, y - direction[1] * i)
+                for i in range(3)
+            ]
+            if all(self.grid.is_empty(cell) for cell in body):
+                for cell in body:
+                    self.grid.set(cell, BODY_CELL)
+                return ArenaSnake(snake_id, body, direction)
+        return None
+
+    def add_food(self):
+        while len(self.food_cells) < self.num_food:
+            cell = self.grid.random_free_cell(self.rng)
+            if cell is None:
+                return
+            self.place_food(cell)
+
+    def place_food(self, cell):
+        self.grid.set(cell, FOOD_CELL)
+        self.food_slots[cell] = len(self.food_cells)
+        self.food_cells.append(cell)
+
+    def remove_food(self, cell):
+        slot = self.food_slots.pop(cell)
+        last_cell = self.food_cells.pop()
+        if last_cell != cell:
+            self.food_cells[slot] = last_cell
+            self.food_slots[last_cell] = slot
+
+    # Arena board always wraps around like portal mode
+    def next_cell(self, cell, direction):
+        x, y = self.grid.unpack(cell)
+        return self.grid.pack(*self.grid.wrap(x + direction[0], y + direction[1]))
+
+    # All snakes move at once: turn, vacate tails, then resolve new heads
+    def step(self, action=None):
+        if action is not None:
+            self.change_direction(self.player, action)
+        alive = [snake for snake in self.snakes if snake.alive]
+        for snake in alive:
+            if snake.id != 0:
+                self.steer(snake)
+            snake.next_head = self.next_cell(snake.head, snake.direction)
+
+        # Tails leave before heads arrive, so following a tail is safe
+        for snake in alive:
+            if snake.growth:
+                snake.growth -= 1
+            else:
+                self.grid.set(snake.body.pop(), EMPTY_CELL)
+
+        # Cell hash of this tick's heads, any cell claimed twice is a head on crash
+        claims = Counter(snake.next_head for snake in alive)
+        dead = []
+        for snake in alive:
+            cell = snake.next_head
+            content = self.grid.get(cell)
+            if claims[cell] > 1 or (content != EMPTY_CELL and content != FOOD_CELL):
+                dead.append(snake)
+                continue
+            if content == FOOD_CELL:
+                self.remove_food(cell)
+                snake.growth += 1
+                if snake.id == 0:
+                    self.score += 1
+            self.grid.set(cell, BODY_CELL)
+            snake.body.appendleft(cell)
+
+        for snake in dead:
+            self.kill(snake)
+        self.respawn()
+        self.add_food()
+        self.ticks += 1
+        return len(dead)
+
+    def change_direction(self, snake, direction):
+        if direction != (-snake.direction[0], -snake.direction[1]):
+            snake.direction = direction
+
+    # Remains of a dead snake are left behind as food on every other segment
+    def kill(self, snake):
+        snake.alive = False
+        for i, cell in enumerate(snake.body):
+            self.grid.set(cell, EMPTY_CELL)
+            if i % 2 == 0:
+                self.place_food(cell)
+        snake.body.clear()
+
+    # Dead AI snakes come back so that the arena stays busy
+    def respawn(self):
+        for i, snake in enumerate(self.snakes):
+            if snake.alive or snake.id == 0:
+                continue
+            new_snake = self.spawn(snake.id, attempts=1)
+            if new_snake is not None:
+                self.snakes[i] = new_snake
+
+    # Heads toward a food cell, only looking at the three cells next to the head
+    def steer(self, snake):
+        grid = self.grid
+        target = snake.target_food
+        if target is None or not grid.is_food(target):
+            target = self.pick_food(snake)
+            snake.target_food = target
+        reverse = (-snake.direction[0], -snake.direction[1])
+        options = []
+        for direction in DIRECTIONS:
+            if direction == reverse:
+                continue
+            cell = self.next_cell(snake.head, direction)
+            content = grid.get(cell)
+            if content == EMPTY_CELL or content == FOOD_CELL:
+                options.append((direction, cell))
+        if not options:
+            return
+        if target is None or self.rng.random() < 0.05:
+            snake.direction = self.rng.choice(options)[0]
+            return
+        target_x, target_y = grid.unpack(target)
+
+        def distance(option):
+            x, y = grid.unpack(option[1])
+            return abs(target_x - x) + abs(target_y - y)
+
+        snake.direction = min(options, key=distance)[0]
+
+    # Closest of a few randomly sampled food cells
+    def pick_food(self, snake, samples=3):
+        if not self.food_cells:
+            return None
+        x, y = self.grid.unpack(snake.head)
+        best = None
+        best_distance = None
+        for _ in range(samples):
+            cell = self.food_cells[self.rng.randrange(len(self.food_cells))]
+            food_x, food_y = self.grid.unpack(cell)
+            distance = abs(food_x - x) + abs(food_y - y)
+            if best_distance is None or distance < best_distance:
+                best = cell
+                best_distance = distance
+        return best
+
+    def alive_count(self):
+        return sum(snake.alive for snake in self.snakes)
@@ -0,0 +1,127 @@
+import random
+import pygame
+from classes.arena import Arena
+from classes.sprite_atlas import sprite_atlas
+from classes.board_screen import BoardScreen, DIRECTION_KEYS
+from constants.constants import BODY_CELL, FOOD_CELL, ARENA_SIZE, ARENA_TICK_MS
+
+
+class ArenaScreen(BoardScreen):
+    """Arena mode rendering and input, player snake among many AI snakes"""
+
+    def __init__(
+        self, surface, rect, audio_manager, state_manager, renderer, profiler
+    ):
+        super().__init__(
+            surface,
+            rect,
+            audio_manager,
+            state_manager,
+            renderer,
+            profiler,
+            ARENA_SIZE,
+        )
+        self.arena = Arena(size=ARENA_SIZE)
+        self.reset_game()
+
+    def play(self, frame_time):
+        if not self.game_active:
+            # Tinted board stays on screen until the player leaves
+            if self.full_redraw:
+                self.draw()
+                self.tint()
+            return
+        if not self.music_active:
+            self.music_active = True
+            self.audio_manager.play_music("In Game")
+
+        if self.update(frame_time):
+            self.full_redraw = True
+        if self.arena.done:
+            self.audio_manager.stop_music()
+            self.audio_manager.death1_sfx.play()
+            self.game_over()
+            return
+        if self.full_redraw:
+            self.draw()
+
+    # Every visible cell may change on a tick, so the viewport is redrawn as a whole
+    def draw(self):
+        self.surface.blit(self.get_background(), (0, 0))
+        self.draw_score()
+        self.surface.set_clip(self.play_rect)
+        self.draw_cells()
+        self.draw_heads()
+        self.surface.set_clip(None)
+        self.full_redraw = False
+        self.renderer.invalidate()
+
+    # Scans visible rows of the shared grid, cost doesn't depend on snake count
+    def draw_cells(self):
+        body_tile = sprite_atlas.get("body")
+        food_tile = sprite_atlas.get("food_1")
+        cells = self.arena.grid.cells
+        cell_rect = self.camera.cell_rect
+        blits = []
+        for start, end in self.camera.visible_rows():
+            for content, tile in ((BODY_CELL, body_tile), (FOOD_CELL, food_tile)):
+                cell = cells.find(content, start, end)
+                while cell != -1:
+                    blits.append((tile, cell_rect(cell)))
+                    cell = cells.find(content, cell + 1, end)
+        self.surface.blits(blits, doreturn=False)
+
+    def draw_heads(self):
+        rival_tile = sprite_atlas.get("rival_head")
+        blits = []
+        for snake in self.arena.snakes[1:]:
+            if snake.alive and self.camera.is_visible(snake.head):
+                blits.append((rival_tile, self.camera.cell_rect(snake.head)))
+        player = self.arena.player
+        if player.alive:
+            blits.append((sprite_atlas.get("head"), self.camera.cell_rect(player.head)))
+        self.surface.blits(blits, doreturn=False)
+
+    def get_score_text(self):
+        return f"Score: {self.arena.score}   Snakes: {self.arena.alive_count()}"
+
+    def get_tick_length(self):
+        return ARENA_TICK_MS
+
+    def is_done(self):
+        return self.arena.done
+
+    def tick(self):
+        score = self.arena.score
+        self.arena.step(self.input_queue.pop(pygame.time.get_ticks()))
+        if self.arena.score != score:
+            self.audio_manager.eat_sfx.play()
+        if not self.arena.done:
+            self.camera.follow(self.arena.player.head)
+
+    def handle_events(self, event):
+        if event.type == pygame.KEYDOWN:
+            if not self.game_active:
+                if event.key in (pygame.K_RETURN, pygame.K_ESCAPE):
+                    self.finish()
+                return
+            if event.key in DIRECTION_KEYS:
+                self.input_queue.push(
+                    DIRECTION_KEYS[event.key],
+                    self.arena.player.direction,
+                    pygame.time.get_ticks(),
+                )
+            if event.key == pygame.K_ESCAPE:
+                self.finish()
+
+    def reset_game(self, seed=None):
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.reset_screen()
+        self.arena.reset(seed)
+        self.camera.center(self.arena.player.head)
+
+    def game_over(self):
+        self.game_active = False
+        self.draw()
+        self.tint()
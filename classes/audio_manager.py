@@ -1,4 +1,5 @@
 import pygame
+from constants.constants import MUSIC_FADE_MS
 
 
 class AudioManager:
@@ -6,20 +7,22 @@ class AudioManager:
         self.file_handler = file_handler
         self.music_volume = 50
         self.sfx_volume = 50
-        self.menu_music = pygame.mixer.Sound("audio/music/Ludum_Dare_30_-_Track_6.ogg")
-        self.in_game_music = pygame.mixer.Sound(
-            "audio/music/Ludum_Dare_38_-_Track_2.ogg"
-        )
+        # Music is streamed from disk, only short sfx are decoded up front
+        self.music_tracks = {
+            "Menu": "audio/music/Ludum_Dare_30_-_Track_6.ogg",
+            "In Game": "audio/music/Ludum_Dare_38_-_Track_2.ogg",
+        }
+        self.current_track = None
+        self.pending_track = None
+        self.pending_fade_ms = 0
         self.eat_sfx = pygame.mixer.Sound("audio/sfx/Eat.ogg")
         self.death1_sfx = pygame.mixer.Sound("audio/sfx/Death_Sound_1.ogg")
         self.death2_sfx = pygame.mixer.Sound("audio/sfx/Death_Sound_4.ogg")
 
     def set_volume(self):
-        settings = self.file_handler.read(self.file_handler.settings_file_name)
-        self.music_volume = settings[0]["music_volume"]
-        self.sfx_volume = settings[0]["sfx_volume"]
-        self.menu_music.set_volume(self.music_volume / 100)
-        self.in_game_music.set_volume(self.music_volume / 100)
+        self.music_volume = self.file_handler.get_volume("Music")
+        self.sfx_volume = self.file_handler.get_volume("SFX")
+        pygame.mixer.music.set_volume(self.music_volume / 100)
         self.eat_sfx.set_volume(self.sfx_volume / 100)
         self.death1_sfx.set_volume(self.sfx_volume / 100)
         self.death2_sfx.set_volume(self.sfx_volume / 100)
@@ -27,10 +30,40 @@ class AudioManager:
     def change_volume(self, audio_type, volume):
         if audio_type == "Music":
             self.music_volume = volume
-            self.menu_music.set_volume(volume / 100)
-            self.in_game_music.set_volume(volume / 100)
+            pygame.mixer.music.set_volume(volume / 100)
         else:
             self.sfx_volume = volume
             self.eat_sfx.set_volume(volume / 100)
             self.death1_sfx.set_volume(volume / 100)
             self.death2_sfx.set_volume(volume / 100)
+
+    def play_music(self, track, fade_ms=MUSIC_FADE_MS):
+        if track == self.current_track and self.pending_track is None:
+            return
+        self.current_track = track
+        # Only one stream plays at a time, so fade out first and start next in update
+        if pygame.mixer.music.get_busy():
+            pygame.mixer.music.fadeout(fade_ms // 2)
+            self.pending_track = track
+            self.pending_fade_ms = fade_ms // 2
+        else:
+            self.start_music(track, fade_ms // 2)
+
+    def stop_music(self, fade_ms=0):
+        self.current_track = None
+        self.pending_track = None
+        if fade_ms:
+            pygame.mixer.music.fadeout(fade_ms)
+        else:
+            pygame.mixer.music.stop()
+
+    def start_music(self, track, fade_ms):
+        self.pending_track = None
+        pygame.mixer.music.load(self.music_tracks[track])
+        pygame.mixer.music.set_volume(self.music_volume / 100)
+        pygame.mixer.music.play(-1, fade_ms=fade_ms)
+
+    # Called every frame to start a track once the previous one faded out
+    def update(self):
+        if self.pending_track is not None and not pygame.mixer.music.get_busy():
+            self.start_music(self.pending_track, self.pending_fade_ms)
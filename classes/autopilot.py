@@ -0,0 +1,60 @@
+from importlib import import_module
+from classes.occupancy_grid import wrap_position
+from constants.constants import EMPTY_CELL, FOOD_CELL
+
+DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+
+# Policies take simulation state and a seeded random generator and return a direction
+def random_policy(state, rng):
+    direction = state["direction"]
+    options = [d for d in DIRECTIONS if d != (-direction[0], -direction[1])]
+    return rng.choice(options)
+
+
+def greedy_policy(state, rng):
+    direction = state["direction"]
+    food_y, food_x = divmod(state["food"], state["width"])
+    best_direction = None
+    best_distance = None
+    for option in DIRECTIONS:
+        if option == (-direction[0], -direction[1]):
+            continue
+        cell = next_cell(state, option)
+        # Avoid walls and body, prefer whatever gets closer to food
+        if state["grid"][cell] not in (EMPTY_CELL, FOOD_CELL):
+            continue
+        y, x = divmod(cell, state["width"])
+        distance = abs(food_x - x) + abs(food_y - y)
+        if best_distance is None or distance < best_distance:
+            best_direction = option
+            best_distance = distance
+    if best_direction is None:
+        return direction
+    return best_direction
+
+
+def next_cell(state, direction):
+    width, height = state["width"], state["height"]
+    y, x = divmod(state["head"], width)
+    x += direction[0]
+    y += direction[1]
+    if state["mode"] == "Portal":
+        x, y = wrap_position(x, y, width, height)
+    return y * width + x
+
+
+POLICIES = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+}
+
+
+# Built-in policy name or "package.module:function" for candidate policies
+def get_policy(name):
+    if name in POLICIES:
+        return POLICIES[name]
+    module_name, _, attribute = name.partition(":")
+    if not attribute:
+        raise ValueError(f"Unknown policy: {name}")
+    return getattr(import_module(module_name), attribute)
@@ -0,0 +1,170 @@
+import numpy as np
+from classes.occupancy_grid import OccupancyGrid
+from constants.constants import (
+    CELL_NUM_X,
+    CELL_NUM_Y,
+    EMPTY_CELL,
+    BODY_CELL,
+    WALL_CELL,
+    FOOD_CELL,
+)
+
+# Direction indices used as actions, -1 keeps the current direction
+DIRECTIONS = np.array([(1, 0), (0, 1), (-1, 0), (0, -1)], dtype=np.int64)
+OUTCOMES = (None, "Body", "Wall", "Victory")
+
+
+class BatchSimulation:
+    """Many independent games stored as NumPy arrays and stepped in lockstep"""
+
+    def __init__(self, num_games, mode="Portal", seed=None):
+        self.num_games = num_games
+        self.mode = mode
+        self.width = CELL_NUM_X
+        self.height = CELL_NUM_Y
+        self.num_cells = self.width * self.height
+        # Every board starts from the same walls as the single game simulation
+        self.empty_board = np.frombuffer(
+            bytes(OccupancyGrid(self.width, self.height).cells), dtype=np.uint8
+        )
+        self.rows = np.arange(num_games)
+        self.grid = np.empty((num_games, self.num_cells), dtype=np.uint8)
+        # Snake cells are kept in a ring buffer per game, head is at head_index
+        self.body = np.zeros((num_games, self.num_cells), dtype=np.int64)
+        self.head_index = np.zeros(num_games, dtype=np.int64)
+        self.length = np.zeros(num_games, dtype=np.int64)
+        self.direction = np.zeros(num_games, dtype=np.int64)
+        self.food = np.zeros(num_games, dtype=np.int64)
+        self.food_value = np.zeros(num_games, dtype=np.int64)
+        self.score = np.zeros(num_games, dtype=np.int64)
+        self.food_eaten = np.zeros(num_games, dtype=np.int64)
+        self.ticks = np.zeros(num_games, dtype=np.int64)
+        self.done = np.zeros(num_games, dtype=bool)
+        # Index into OUTCOMES
+        self.outcome = np.zeros(num_games, dtype=np.int64)
+        self.rng = np.random.default_rng(seed)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.reset_games(self.rows)
+        return self.get_state()
+
+    # Restart only finished games, useful for continuous training loops
+    def reset_done(self):
+        self.reset_games(self.rows[self.done])
+        return self.get_state()
+
+    def reset_games(self, games):
+        if len(games) == 0:
+            return
+        x, y = CELL_NUM_X // 4, CELL_NUM_Y // 2
+        start_cells = np.array([y * self.width + x - i for i in (2, 1, 0)])
+        self.grid[games] = self.empty_board
+        self.grid[games[:, None], start_cells] = BODY_CELL
+        self.body[games, :3] = start_cells
+        self.head_index[games] = 2
+        self.length[games] = 3
+        self.direction[games] = 0
+        self.score[games] = 0
+        self.food_eaten[games] = 0
+        self.ticks[games] = 0
+        self.done[games] = False
+        self.outcome[games] = 0
+        self.food_value[games] = 1
+        self.place_food(games)
+
+    # Actions is an array of direction indices, one per game
+    def step(self, actions):
+        actions = np.asarray(actions, dtype=np.int64)
+        games = self.rows[~self.done]
+        reward = np.zeros(self.num_games, dtype=np.int64)
+        if len(games) == 0:
+            return self.get_state(), reward, self.done.copy()
+
+        # Ignore missing actions and turning straight back into the body
+        action = actions[games]
+        direction = self.direction[games]
+        turn = (action >= 0) & (action != (direction + 2) % 4)
+        direction = np.where(turn, action, direction)
+        self.direction[games] = direction
+
+        head = self.body[games, self.head_index[games]]
+        y, x = np.divmod(head, self.width)
+        x = x + DIRECTIONS[direction, 0]
+        y = y + DIRECTIONS[direction, 1]
+        # Check boundries only for head since the rest of segments follow
+        if self.mode == "Portal":
+            x = np.where(x < 1, self.width - 2, np.where(x > self.width - 2, 1, x))
+            y = np.where(y < 3, self.height - 2, np.where(y > self.height - 2, 3, y))
+        new_head = y * self.width + x
+
+        tail_index = (self.head_index[games] - self.length[games] + 1) % self.num_cells
+        tail = self.body[games, tail_index]
+        content = self.grid[games, new_head]
+        # Tail moves out of the way in the same tick, so the head may take its cell
+        content = np.where(new_head == tail, EMPTY_CELL, content)
+
+        body_hit = content == BODY_CELL
+        wall_hit = content == WALL_CELL
+        ate = content == FOOD_CELL
+        self.done[games[body_hit]] = True
+        self.outcome[games[body_hit]] = 1
+        self.done[games[wall_hit]] = True
+        self.outcome[games[wall_hit]] = 2
+
+        alive = ~(body_hit | wall_hit)
+        moving = games[alive]
+        # Eating keeps the tail in place instead of appending a new segment
+        shrinking = alive & ~ate
+        self.grid[games[shrinking], tail[shrinking]] = EMPTY_CELL
+        self.head_index[moving] = (self.head_index[moving] + 1) % self.num_cells
+        self.body[moving, self.head_index[moving]] = new_head[alive]
+        self.grid[moving, new_head[alive]] = BODY_CELL
+        self.ticks[games] += 1
+
+        eating = games[ate]
+        if len(eating):
+            reward[eating] = self.food_value[eating]
+            self.score[eating] += self.food_value[eating]
+            self.length[eating] += 1
+            self.food_eaten[eating] += 1
+            self.change_food(eating)
+        return self.get_state(), reward, self.done.copy()
+
+    def change_food(self, games):
+        # Change food value based on number of food items eaten so far
+        eaten = self.food_eaten[games]
+        self.food_value[games] = np.where(
+            eaten % 10 == 0, 10, np.where(eaten % 5 == 0, 5, 1)
+        )
+        self.place_food(games)
+
+    # Pick a uniformly random empty cell per game in one vectorized pass
+    def place_food(self, games):
+        empty = self.grid[games] == EMPTY_CELL
+        weights = self.rng.random(empty.shape) * empty
+        cells = np.argmax(weights, axis=1)
+        has_room = empty.any(axis=1)
+
+        placed = games[has_room]
+        self.food[placed] = cells[has_room]
+        self.grid[placed, cells[has_room]] = FOOD_CELL
+        # Snake covers the whole board when there is nowhere left to place food
+        full = games[~has_room]
+        self.food[full] = -1
+        self.done[full] = True
+        self.outcome[full] = 3
+
+    def get_state(self):
+        return {
+            "head": self.body[self.rows, self.head_index],
+            "direction": self.direction,
+            "length": self.length,
+            "food": self.food,
+            "food_value": self.food_value,
+            "score": self.score,
+            "ticks": self.ticks,
+            "outcome": self.outcome,
+            "grid": self.grid,
+        }
@@ -0,0 +1,255 @@
+import platform
+import random
+import tempfile
+import timeit
+import pygame
+from classes.arena import Arena
+from classes.file_handler import FileHandler
+from classes.food import Food
+from classes.occupancy_grid import OccupancyGrid
+from classes.simulation import Simulation
+from classes.snake import Snake
+from utils.utils import draw_text, text_cache
+from constants.constants import (
+    CELL_NUM_X,
+    CELL_NUM_Y,
+    BODY_CELL,
+    DARK_COLOR,
+    FONT,
+    MEDIUM_FONT,
+)
+
+SNAKE_LENGTHS = (3, 50, 500, 5000)
+FILL_RATIOS = (0, 0.5, 0.9, 0.99)
+MENU_STATES = (
+    "Main Menu",
+    "Mode Select",
+    "In Game Menu",
+    "Leaderboards",
+    "Options",
+    "Credits",
+)
+
+game = None
+data_dir = None
+
+
+# Screens need a display, so a single game is created on first use and shared.
+# Its leaderboards and settings go to a temporary directory, so that running
+# benchmarks never touches the player's files
+def get_game():
+    global game, data_dir
+    if game is None:
+        # Imported here so that pure simulation cases don't need a display
+        from classes.game import Game
+
+        data_dir = tempfile.TemporaryDirectory()
+        game = Game(file_handler=FileHandler(data_dir.name))
+    return game
+
+
+# Stops the game's file threads and removes its temporary directory
+def close_game():
+    global game, data_dir
+    if game is None:
+        return
+    game.file_handler.close()
+    data_dir.cleanup()
+    game = None
+    data_dir = None
+
+
+# Every case builds its state up front and returns the function to be timed
+
+
+def snake_move(length):
+    # Snake lies on a single looping row, so it moves forever without colliding
+    snake = Snake(length, (length + 2, CELL_NUM_Y // 2), length + 10, CELL_NUM_Y)
+    return snake.move
+
+
+def food_change_position(fill_ratio):
+    grid = OccupancyGrid(CELL_NUM_X, CELL_NUM_Y)
+    free_cells = list(grid.free_cells)
+    for cell in free_cells[: int(len(free_cells) * fill_ratio)]:
+        grid.set(cell, BODY_CELL)
+    food = Food(grid, 1)
+    rng = random.Random(0)
+    return lambda: food.change_position(rng)
+
+
+def collision_check():
+    grid = Simulation("Wall", seed=0).snake.grid
+    rng = random.Random(0)
+    cells = [rng.randrange(len(grid.cells)) for _ in range(1000)]
+
+    def check():
+        for cell in cells:
+            grid.is_body(cell) or grid.is_wall(cell)
+
+    return check
+
+
+def simulation_step():
+    simulation = Simulation("Portal", seed=0)
+
+    def step():
+        if simulation.done:
+            simulation.reset(0)
+        simulation.step()
+
+    return step
+
+
+# Player snake is steered like the rest, so the arena keeps running
+def arena_step():
+    arena = Arena(seed=0)
+
+    def step():
+        if arena.done:
+            arena.reset(0)
+        arena.steer(arena.player)
+        arena.step()
+
+    return step
+
+
+def draw_text_case(cached):
+    surface = get_game().display
+
+    def draw():
+        if not cached:
+            text_cache.clear()
+        draw_text(surface, (100, 100), "Leaderboards", FONT, MEDIUM_FONT, DARK_COLOR)
+
+    return draw
+
+
+# Forces the menu to compose again instead of reusing its retained frame
+def menu_draw(state):
+    menu = get_game().get_screen(state)
+
+    def draw():
+        menu.invalidate()
+        menu.show()
+        menu.draw()
+
+    return draw
+
+
+def in_game_play():
+    current_game = get_game()
+    in_game = current_game.in_game
+    in_game.set_mode("Portal")
+    in_game.reset_game(0)
+
+    # Every frame carries enough time for exactly one simulation tick
+    def play():
+        if not in_game.game_active:
+            in_game.reset_game(0)
+        current_game.state_manager.current_state = "In Game"
+        in_game.play(in_game.simulation.snake_speed)
+
+    return play
+
+
+def in_game_draw():
+    in_game = get_game().in_game
+    return in_game.draw
+
+
+def get_cases():
+    cases = []
+    for length in SNAKE_LENGTHS:
+        cases.append((f"snake_move_length_{length}", lambda n=length: snake_move(n)))
+    for fill_ratio in FILL_RATIOS:
+        cases.append(
+            (
+                f"food_change_position_fill_{int(fill_ratio * 100)}",
+                lambda r=fill_ratio: food_change_position(r),
+            )
+        )
+    cases.append(("collision_check_x1000", collision_check))
+    cases.append(("simulation_step", simulation_step))
+    cases.append(("arena_step", arena_step))
+    cases.append(("draw_text_cached", lambda: draw_text_case(True)))
+    cases.append(("draw_text_uncached", lambda: draw_text_case(False)))
+    for state in MENU_STATES:
+        name = "menu_draw_" + state.lower().replace(" ", "_")
+        cases.append((name, lambda s=state: menu_draw(s)))
+    cases.append(("in_game_play_frame", in_game_play))
+    cases.append(("in_game_draw_full", in_game_draw))
+    return cases
+
+
+# Best of `repeat` runs, each long enough for timeit to be accurate
+def run(names=None, repeat=5):
+    results = {}
+    try:
+        for name, create_case in get_cases():
+            if names and not any(part in name for part in names):
+                continue
+            timer = timeit.Timer(create_case())
+            number, _ = timer.autorange()
+            best = min(timer.repeat(repeat, number)) / number
+            results[name] = {"ns_per_call": best * 1e9}
+    finally:
+        close_game()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    rows = []
+    baseline_results = baseline["results"]
+    for name, result in current["results"].items():
+        if name not in baseline_results:
+            rows.append((name, None, result["ns_per_call"], None, "new"))
+            continue
+        before = baseline_results[name]["ns_per_call"]
+        after = result["ns_per_call"]
+        ratio = after / before
+        if ratio > 1 + threshold:
+            status = "REGRESSION"
+        elif ratio < 1 - threshold:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append((name, before, after, ratio, status))
+    return rows
+
+
+def format_duration(nanoseconds):
+    if nanoseconds is None:
+        return "-"
+    if nanoseconds >= 1e6:
+        return f"{nanoseconds / 1e6:.2f} ms"
+    if nanoseconds >= 1e3:
+        return f"{nanoseconds / 1e3:.2f} us"
+    return f"{nanoseconds:.0f} ns"
+
+
+def format_results(results):
+    lines = [f"{'Benchmark':<36}{'Time':>12}", "-" * 48]
+    for name, result in results["results"].items():
+        lines.append(f"{name:<36}{format_duration(result['ns_per_call']):>12}")
+    return "\n".join(lines)
+
+
+def format_comparison(rows):
+    header = f"{'Benchmark':<36}{'Baseline':>12}{'Current':>12}{'Ratio':>8}  Status"
+    lines = [header, "-" * len(header)]
+    for name, before, after, ratio, status in rows:
+        ratio_text = "-" if ratio is None else f"{ratio:.2f}x"
+        lines.append(
+            f"{name:<36}{format_duration(before):>12}{format_duration(after):>12}"
+            f"{ratio_text:>8}  {status}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,139 @@
+import pygame
+from classes.input_queue import InputQueue
+from classes.camera import Camera
+from classes.chunk_cache import ChunkCache
+from utils.utils import draw_text, tint_display
+from constants.constants import (
+    CELL_SIZE,
+    DISPLAY_WIDTH,
+    DISPLAY_HEIGHT,
+    DARK_COLOR,
+    BRIGHT_COLOR,
+    FONT,
+    MEDIUM_FONT,
+    MAX_CATCH_UP_TICKS,
+    INPUT_QUEUE_SIZE,
+)
+
+DIRECTION_KEYS = {
+    pygame.K_w: (0, -1),
+    pygame.K_UP: (0, -1),
+    pygame.K_d: (1, 0),
+    pygame.K_RIGHT: (1, 0),
+    pygame.K_s: (0, 1),
+    pygame.K_DOWN: (0, 1),
+    pygame.K_a: (-1, 0),
+    pygame.K_LEFT: (-1, 0),
+}
+
+
+# Parent class of screens that play on a board, subclasses provide
+# get_tick_length, is_done, tick, get_score_text and reset_game
+class BoardScreen:
+    def __init__(
+        self,
+        surface,
+        rect,
+        audio_manager,
+        state_manager,
+        renderer,
+        profiler,
+        board_size,
+    ):
+        self.surface = surface
+        self.rect = rect
+        self.audio_manager = audio_manager
+        self.state_manager = state_manager
+        self.renderer = renderer
+        self.profiler = profiler
+        # Only the part of the board around snake head is drawn
+        self.camera = Camera(*board_size)
+        self.chunk_cache = ChunkCache(*board_size)
+        self.input_queue = InputQueue(INPUT_QUEUE_SIZE)
+        self.game_active = True
+        self.music_active = False
+        # Milliseconds of frame time not yet consumed by simulation ticks
+        self.accumulator = 0
+        # Replays can be watched faster, game time runs this many times real time
+        self.playback_speed = 1
+        self.full_redraw = True
+        self.background = pygame.Surface((DISPLAY_WIDTH, DISPLAY_HEIGHT)).convert()
+        self.background_camera = None
+        self.score_rect = pygame.Rect(0, 0, DISPLAY_WIDTH, CELL_SIZE * 3 - 2)
+        # Cells scrolled under the score strip must not be drawn over it
+        top = self.score_rect.bottom
+        self.play_rect = pygame.Rect(0, top, DISPLAY_WIDTH, DISPLAY_HEIGHT - top)
+        self.score_surface = pygame.Surface(self.score_rect.size)
+        self.drawn_score = None
+
+    def show(self):
+        self.full_redraw = True
+
+    def finish(self):
+        self.reset_game()
+        self.state_manager.update_state("Main Menu")
+        self.audio_manager.play_music("Menu")
+
+    # Background never changes during a run, so it's only composed when camera moves
+    def get_background(self):
+        camera_position = (self.camera.x, self.camera.y)
+        if self.background_camera != camera_position:
+            self.chunk_cache.compose(self.background, self.camera)
+            self.background_camera = camera_position
+        return self.background
+
+    # Re-render score strip only when its text actually changes
+    def draw_score(self):
+        text = self.get_score_text()
+        if self.drawn_score != text:
+            self.score_surface.fill(BRIGHT_COLOR)
+            draw_text(
+                self.score_surface,
+                (self.score_rect.centerx, (CELL_SIZE * 3) // 2),
+                text,
+                FONT,
+                MEDIUM_FONT,
+                (DARK_COLOR),
+            )
+            self.drawn_score = text
+        self.surface.blit(self.score_surface, self.score_rect)
+
+    def score_changed(self):
+        return self.drawn_score != self.get_score_text()
+
+    # Fixed timestep: simulation advances in whole ticks regardless of frame rate,
+    # returns whether any tick ran
+    def update(self, frame_time):
+        self.accumulator += frame_time * self.playback_speed
+        ticks = 0
+        while self.accumulator >= self.get_tick_length():
+            if self.is_done():
+                break
+            # Catch up on missed frames, but drop time that can't be caught up
+            if ticks == MAX_CATCH_UP_TICKS:
+                self.accumulator %= self.get_tick_length()
+                break
+            # Speed changes only shorten following ticks, phase is kept
+            tick_length = self.get_tick_length()
+            self.accumulator -= tick_length
+            with self.profiler.measure_tick(tick_length / self.playback_speed):
+                self.tick()
+            ticks += 1
+        return ticks > 0
+
+    # State shared by every new run
+    def reset_screen(self):
+        self.input_queue.clear()
+        self.game_active = True
+        self.music_active = False
+        self.full_redraw = True
+        self.accumulator = 0
+
+    def tint(self):
+        tint_display(
+            self.surface,
+            DISPLAY_WIDTH,
+            DISPLAY_HEIGHT,
+            (128, 128, 128),
+        )
+        self.renderer.invalidate()
@@ -0,0 +1,65 @@
+import pygame
+from constants.constants import CELL_NUM_X, CELL_NUM_Y, CELL_SIZE, CAMERA_MARGIN
+
+
+class Camera:
+    """Part of the board shown on the display, follows snake head on large boards"""
+
+    def __init__(self, board_width, board_height, margin=CAMERA_MARGIN):
+        self.board_width = board_width
+        self.board_height = board_height
+        # Viewport in cells, its top rows are covered by the score strip
+        self.width = CELL_NUM_X
+        self.height = CELL_NUM_Y
+        self.top = 3
+        self.margin = margin
+        self.x = 0
+        self.y = 0
+
+    def center(self, cell):
+        y, x = divmod(cell, self.board_width)
+        return self.move_to(
+            x - self.width // 2, y - (self.top + self.height) // 2
+        )
+
+    # Only moves once the cell gets closer than margin to the viewport edge
+    def follow(self, cell):
+        y, x = divmod(cell, self.board_width)
+        new_x, new_y = self.x, self.y
+        if x < self.x + self.margin:
+            new_x = x - self.margin
+        elif x > self.x + self.width - 1 - self.margin:
+            new_x = x - (self.width - 1 - self.margin)
+        if y < self.y + self.top + self.margin:
+            new_y = y - self.top - self.margin
+        elif y > self.y + self.height - 1 - self.margin:
+            new_y = y - (self.height - 1 - self.margin)
+        return self.move_to(new_x, new_y)
+
+    # Returns whether the camera actually moved
+    def move_to(self, x, y):
+        x = max(0, min(x, self.board_width - self.width))
+        y = max(0, min(y, self.board_height - self.height))
+        if (x, y) == (self.x, self.y):
+            return False
+        self.x = x
+        self.y = y
+        return True
+
+    def cell_rect(self, cell):
+        y, x = divmod(cell, self.board_width)
+        return pygame.Rect(
+            (x - self.x) * CELL_SIZE, (y - self.y) * CELL_SIZE, CELL_SIZE, CELL_SIZE
+        )
+
+    def is_visible(self, cell):
+        y, x = divmod(cell, self.board_width)
+        return (
+            self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
+        )
+
+    # First and past the last packed cell of every board row inside the viewport
+    def visible_rows(self):
+        for y in range(self.y, self.y + self.height):
+            start = y * self.board_width + self.x
+            yield start, start + self.width
@@ -0,0 +1,85 @@
+from collections import OrderedDict
+import pygame
+from utils.utils import draw_border
+from constants.constants import (
+    CELL_SIZE,
+    DARK_COLOR,
+    BRIGHT_COLOR,
+    CHUNK_SIZE,
+    CHUNK_CACHE_SIZE,
+)
+
+
+class ChunkCache:
+    """Board background pre-rendered in square chunks, bounded LRU
+
+    Only chunks crossed by the border differ, every other chunk shares one plain
+    surface, so memory doesn't grow with board size.
+    """
+
+    def __init__(self, board_width, board_height, max_size=CHUNK_CACHE_SIZE):
+        self.chunk_pixels = CHUNK_SIZE * CELL_SIZE
+        self.max_size = max_size
+        self.chunks = OrderedDict()
+        self.plain_chunk = None
+        # Same border that surrounds the play area on the default board
+        self.border = pygame.Rect(
+            CELL_SIZE - 2,
+            CELL_SIZE * 3 - 2,
+            CELL_SIZE * (board_width - 2) + 4,
+            CELL_SIZE * (board_height - 4) + 4,
+        )
+        self.inside_border = self.border.inflate(-4, -4)
+
+    def get(self, chunk_x, chunk_y):
+        rect = pygame.Rect(
+            chunk_x * self.chunk_pixels,
+            chunk_y * self.chunk_pixels,
+            self.chunk_pixels,
+            self.chunk_pixels,
+        )
+        if not rect.colliderect(self.border) or self.inside_border.contains(rect):
+            if self.plain_chunk is None:
+                self.plain_chunk = self.create_chunk(None)
+            return self.plain_chunk
+
+        key = (chunk_x, chunk_y)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+        chunk = self.create_chunk(rect)
+        self.chunks[key] = chunk
+        if len(self.chunks) > self.max_size:
+            self.chunks.popitem(last=False)
+        return chunk
+
+    def create_chunk(self, rect):
+        chunk = pygame.Surface((self.chunk_pixels, self.chunk_pixels))
+        if pygame.display.get_surface() is not None:
+            chunk = chunk.convert()
+        chunk.fill(BRIGHT_COLOR)
+        if rect is not None:
+            draw_border(
+                chunk,
+                (self.border.x - rect.x, self.border.y - rect.y),
+                self.border.width,
+                self.border.height,
+                DARK_COLOR,
+                2,
+            )
+        return chunk
+
+    # Draws background seen by the camera, cost depends only on viewport size
+    def compose(self, surface, camera):
+        left = camera.x * CELL_SIZE
+        top = camera.y * CELL_SIZE
+        right = left + surface.get_width()
+        bottom = top + surface.get_height()
+        size = self.chunk_pixels
+        blits = []
+        for chunk_y in range(top // size, (bottom - 1) // size + 1):
+            for chunk_x in range(left // size, (right - 1) // size + 1):
+                position = (chunk_x * size - left, chunk_y * size - top)
+                blits.append((self.get(chunk_x, chunk_y), position))
+        surface.blits(blits, doreturn=False)
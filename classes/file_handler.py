@@ -1,15 +1,22 @@
 from datetime import datetime
 import json
+import logging
 import os
-import sys
-import pygame
+from classes.io_worker import IOWorker, write_atomic
+from classes.leaderboard_store import LeaderboardStore
+from classes.settings_store import SettingsStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = [{"music_volume": 100, "sfx_volume": 100}]
 
 
 class FileHandler:
-    def __init__(self):
+    def __init__(self, data_dir=""):
         self.portal_leaderboards_file_name = "portal_leaderboards.json"
         self.wall_leaderboards_file_name = "wall_leaderboards.json"
-        self.leaderboards_folder_name = "leaderboards"
+        # Leaderboards and settings live in data_dir, current directory by default
+        self.leaderboards_folder_name = os.path.join(data_dir, "leaderboards")
         self.wall_leaderboards_file_name = "wall_leaderboards.json"
         self.portal_leaderboards_path = os.path.join(
             self.leaderboards_folder_name, self.portal_leaderboards_file_name
@@ -17,36 +24,75 @@ class FileHandler:
         self.wall_leaderboards_path = os.path.join(
             self.leaderboards_folder_name, self.wall_leaderboards_file_name
         )
-        self.settings_file_name = "settings.json"
+        self.replays_path = os.path.join(self.leaderboards_folder_name, "replays")
+        self.database_path = os.path.join(
+            self.leaderboards_folder_name, "leaderboards.db"
+        )
+        self.store = None
+        self.settings_file_name = os.path.join(data_dir, "settings.json")
+        self.settings = None
+        # Everything touching the disk during the game loop runs on this worker
+        self.io = IOWorker()
+        self.errors = []
+
+    # Errors are kept and logged instead of closing the game
+    def report_error(self, error):
+        logger.error("An error has occured: %s", error)
+        self.errors.append(str(error))
 
     # Reading related functions
 
     def paths_exists(self):
         if (
-            not os.path.exists(self.portal_leaderboards_path)
-            or not os.path.exists(self.wall_leaderboards_path)
+            not os.path.exists(self.replays_path)
             or not os.path.exists(self.settings_file_name)
         ):
             return False
 
         return True
 
-    def read(self, path):
-        try:
-            with open(path, "r", encoding="utf-8") as file:
-                return json.load(file)
-        except Exception as e:
-            pygame.quit()
-            sys.exit(f"An error has occured: {e}")
-
+    # Legacy JSON leaderboards, only read when migrating into the store
     def get_path(self, mode):
         if mode == "Portal":
             return self.portal_leaderboards_path
         return self.wall_leaderboards_path
 
-    def get_data(self, mode):
-        path = self.get_path(mode)
-        return self.read(path)
+    # Only called from jobs running on the single worker thread, so it needs no lock
+    def get_store(self):
+        if self.store is None:
+            self.store = LeaderboardStore(self.database_path)
+            # Legacy files are loaded directly, waiting on read_json from the
+            # worker itself would never finish
+            for mode in ("Portal", "Wall"):
+                self.store.migrate_json(mode, self.get_path(mode), self.io.load_json)
+        return self.store
+
+    def get_settings(self):
+        # Settings are needed before the first frame, so startup waits for the read
+        if self.settings is None:
+            try:
+                data = self.io.read_json(self.settings_file_name).result()
+            except Exception as e:
+                self.report_error(e)
+                data = DEFAULT_SETTINGS
+            self.settings = SettingsStore(self.settings_file_name, data)
+        return self.settings
+
+    def get_volume(self, audio_type):
+        if audio_type == "Music":
+            return self.get_settings().get("music_volume")
+        return self.get_settings().get("sfx_volume")
+
+    def get_data(self, mode, limit=10):
+        try:
+            return self.get_store().top(mode, limit)
+        except Exception as e:
+            self.report_error(e)
+            return []
+
+    # Same as get_data, but the query runs on the worker
+    def request_data(self, mode, limit=10):
+        return self.io.submit(self.get_data, mode, limit)
 
     # Writing related functions
 
@@ -54,52 +100,71 @@ class FileHandler:
         try:
             if not os.path.exists(self.leaderboards_folder_name):
                 os.makedirs(self.leaderboards_folder_name)
-            if not os.path.exists(self.portal_leaderboards_path):
-                with open(self.portal_leaderboards_path, "w", encoding="utf-8") as file:
-                    data = []
-                    json.dump(data, file)
-            if not os.path.exists(self.wall_leaderboards_path):
-                with open(self.wall_leaderboards_path, "w", encoding="utf-8") as file:
-                    data = []
-                    json.dump(data, file)
+            if not os.path.exists(self.replays_path):
+                os.makedirs(self.replays_path)
             if not os.path.exists(self.settings_file_name):
-                with open(self.settings_file_name, "w", encoding="utf-8") as file:
-                    data = [{"music_volume": 100, "sfx_volume": 100}]
-                    json.dump(data, file, indent=4)
+                data = json.dumps(DEFAULT_SETTINGS, indent=4)
+                write_atomic(self.settings_file_name, data.encode("utf-8"))
+        except Exception as e:
+            self.report_error(e)
+
+    def submit_entry(self, mode, name, score, replay=None):
+        return self.io.submit(self.add_entry, mode, name, score, replay)
+
+    def add_entry(self, mode, name, score, replay=None):
+        try:
+            self.write_entry(mode, name, score, replay)
         except Exception as e:
-            pygame.quit()
-            sys.exit(f"An error has occured: {e}")
+            self.report_error(e)
 
-    def add_entry(self, mode, name, score):
+    def write_entry(self, mode, name, score, replay):
+        date = datetime.now()
         entry = {
             "name": name,
             "score": score,
-            "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "date": date.strftime("%Y-%m-%d %H:%M:%S"),
         }
-        path = self.get_path(mode)
-        data = self.read(path)
-        data.append(entry)
-        data.sort(key=lambda x: x["score"], reverse=True)
-        data = data[:10]
+        if replay is not None:
+            entry["replay"] = self.save_replay(mode, name, date, replay)
+        store = self.get_store()
+        store.add(mode, entry)
+        # Full history is kept, but only top 10 entries keep their replays
+        for file_name in store.release_replays(mode):
+            self.remove_replay(file_name)
+
+    def get_replay_path(self, file_name):
+        return os.path.join(self.replays_path, file_name)
 
+    def save_replay(self, mode, name, date, replay):
+        file_name = f"{mode.lower()}_{date.strftime('%Y%m%d_%H%M%S')}_{name}.replay"
         try:
-            with open(path, "w", encoding="utf-8") as file:
-                json.dump(data, file, indent=4)
+            write_atomic(self.get_replay_path(file_name), replay.to_bytes())
         except Exception as e:
-            pygame.quit()
-            sys.exit(f"An error has occured: {e}")
+            # Score is still worth keeping without its replay
+            self.report_error(e)
+            return None
+        return file_name
 
-    def update_settings(self, audio_type, volume):
-        settings = self.read(self.settings_file_name)
+    def remove_replay(self, file_name):
+        if file_name is None:
+            return
+        try:
+            if os.path.exists(self.get_replay_path(file_name)):
+                os.remove(self.get_replay_path(file_name))
+        except Exception as e:
+            self.report_error(e)
 
+    def update_settings(self, audio_type, volume):
         if audio_type == "Music":
-            settings[0]["music_volume"] = volume
+            self.get_settings().set("music_volume", volume)
         else:
-            settings[0]["sfx_volume"] = volume
+            self.get_settings().set("sfx_volume", volume)
 
-        try:
-            with open(self.settings_file_name, "w", encoding="utf-8") as file:
-                json.dump(settings, file, indent=4)
-        except Exception as e:
-            pygame.quit()
-            sys.exit(f"An error has occured: {e}")
+    # Writes pending settings and entries before the game exits, closing the store
+    # last checkpoints its WAL so no sidecar files are left behind
+    def close(self):
+        if self.settings is not None:
+            self.settings.close()
+        self.io.close()
+        if self.store is not None:
+            self.store.close()
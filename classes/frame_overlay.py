@@ -0,0 +1,63 @@
+import pygame
+from utils.utils import font_registry
+from constants.constants import (
+    DARK_COLOR,
+    BRIGHT_COLOR,
+    FONT,
+    SMALL_FONT,
+    FRAME_OVERLAY_REFRESH_MS,
+)
+
+
+class FrameOverlay:
+    """Frame profiler numbers drawn over the bottom of the display"""
+
+    def __init__(self, surface, rect, profiler, renderer):
+        self.surface = surface
+        self.profiler = profiler
+        self.renderer = renderer
+        self.visible = False
+        self.line_height = SMALL_FONT + 4
+        self.rect = pygame.Rect(0, 0, rect.width, self.line_height * 2)
+        self.rect.bottom = rect.bottom
+        self.panel = pygame.Surface(self.rect.size)
+        self.refreshed_at = None
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.refreshed_at = None
+
+    def draw(self):
+        if not self.visible:
+            return
+        # Numbers change every frame, refreshing them slower keeps them readable
+        now = pygame.time.get_ticks()
+        refreshed_at = self.refreshed_at
+        if refreshed_at is None or now - refreshed_at >= FRAME_OVERLAY_REFRESH_MS:
+            self.compose()
+            self.refreshed_at = now
+        self.surface.blit(self.panel, self.rect)
+        self.renderer.mark_rect(self.rect)
+
+    def compose(self):
+        self.panel.fill(DARK_COLOR)
+        stats = self.profiler.get_stats()
+        if stats is None:
+            return
+        phases = stats["phases"]
+        summary = (
+            f"FPS {stats['fps']:.0f}  frame {stats['frame']:.2f} ms  "
+            f"worst {stats['worst']:.2f} ms  jitter {stats['jitter']:.2f} ms"
+        )
+        # Only states running a simulation have ticks
+        if stats["tick_jitter"] is not None:
+            summary += f"  tick jitter {stats['tick_jitter']:.1f} ms"
+        lines = (
+            summary,
+            "  ".join(f"{phase} {phases[phase]:.2f}" for phase in phases),
+        )
+        # Drawn with the font directly so that changing numbers don't fill text cache
+        font = font_registry.get(FONT, SMALL_FONT)
+        for i, line in enumerate(lines):
+            text_surface = font.render(line, False, BRIGHT_COLOR)
+            self.panel.blit(text_surface, (4, 2 + self.line_height * i))
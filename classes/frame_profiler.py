@@ -0,0 +1,151 @@
+from collections import defaultdict, deque
+from contextlib import contextmanager
+import csv
+import json
+import time
+
+PHASES = ("events", "draw", "update", "present", "tick")
+# Frame is the whole frame, work excludes waiting in clock.tick and jitter is
+# the distance from target frame time, every phase gets its own histogram too.
+# Simulation ticks are timed separately: how long a tick ran, time since the
+# previous tick and the distance of that interval from the tick length
+TICK_METRICS = ("sim_tick", "tick_interval", "tick_jitter")
+METRICS = (
+    ("frame", "work", "jitter")
+    + tuple(f"phase_{phase}" for phase in PHASES)
+    + TICK_METRICS
+)
+
+
+class FrameProfiler:
+    """Splits every frame into phases and keeps frame time histograms per state"""
+
+    def __init__(
+        self, fps, export_path=None, window=120, max_bucket=100, max_tick_bucket=1000
+    ):
+        self.target = 1000 / fps
+        self.export_path = export_path
+        # Rolling window of recent frames for the overlay
+        self.frames = deque(maxlen=window)
+        self.tick_jitters = deque(maxlen=window)
+        # Histograms have 1 ms buckets, last bucket collects everything slower
+        self.max_bucket = max_bucket
+        # Ticks are much longer than frames at low snake speeds
+        self.max_tick_bucket = max_tick_bucket
+        self.histograms = {}
+        self.frame_start = None
+        self.phase_start = None
+        self.phases = {}
+        # Ticks of the current frame, added to histograms once its state is known
+        self.ticks = []
+        self.last_tick = None
+        self.last_state = None
+
+    def begin_frame(self):
+        now = time.perf_counter()
+        self.frame_start = now
+        self.phase_start = now
+        self.phases = dict.fromkeys(PHASES, 0.0)
+
+    # Time since previous mark is added to given phase
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases[phase] += (now - self.phase_start) * 1000
+        self.phase_start = now
+
+    # Wraps a simulation tick, tick_length is the real time it is meant to take
+    @contextmanager
+    def measure_tick(self, tick_length):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            if self.last_tick is None:
+                interval = None
+            else:
+                interval = (start - self.last_tick) * 1000
+                self.tick_jitters.append(abs(interval - tick_length))
+            self.last_tick = start
+            self.ticks.append(((end - start) * 1000, interval, tick_length))
+
+    def end_frame(self, state):
+        frame_time = (time.perf_counter() - self.frame_start) * 1000
+        self.frames.append((frame_time, self.phases))
+        ticks = self.ticks
+        self.ticks = []
+        # Pauses between states aren't tick intervals
+        if state != self.last_state:
+            self.last_state = state
+            self.last_tick = None
+            self.tick_jitters.clear()
+        if self.export_path is None:
+            return
+        histograms = self.histograms.get(state)
+        if histograms is None:
+            histograms = {
+                metric: [0] * (self.get_max_bucket(metric) + 1) for metric in METRICS
+            }
+            self.histograms[state] = histograms
+        self.add_sample(histograms["frame"], frame_time)
+        self.add_sample(histograms["work"], frame_time - self.phases["tick"])
+        self.add_sample(histograms["jitter"], abs(frame_time - self.target))
+        for phase, milliseconds in self.phases.items():
+            self.add_sample(histograms[f"phase_{phase}"], milliseconds)
+        for duration, interval, tick_length in ticks:
+            self.add_sample(histograms["sim_tick"], duration)
+            if interval is not None:
+                self.add_sample(histograms["tick_interval"], interval)
+                self.add_sample(histograms["tick_jitter"], abs(interval - tick_length))
+
+    def get_max_bucket(self, metric):
+        if metric == "tick_interval":
+            return self.max_tick_bucket
+        return self.max_bucket
+
+    def add_sample(self, histogram, milliseconds):
+        histogram[min(int(milliseconds), len(histogram) - 1)] += 1
+
+    def get_stats(self):
+        if not self.frames:
+            return None
+        count = len(self.frames)
+        frame_times = [frame_time for frame_time, _ in self.frames]
+        average = sum(frame_times) / count
+        tick_jitters = self.tick_jitters
+        return {
+            "tick_jitter": (
+                sum(tick_jitters) / len(tick_jitters) if tick_jitters else None
+            ),
+            "fps": 1000 / average if average else 0,
+            "frame": average,
+            "worst": max(frame_times),
+            "jitter": sum(abs(t - self.target) for t in frame_times) / count,
+            "phases": {
+                phase: sum(phases[phase] for _, phases in self.frames) / count
+                for phase in PHASES
+            },
+        }
+
+    # Format is picked from file extension, CSV for .csv and JSON otherwise
+    def export(self):
+        if self.export_path is None:
+            return
+        rows = [
+            (state, metric, bucket, count)
+            for state, histograms in sorted(self.histograms.items())
+            for metric, histogram in histograms.items()
+            for bucket, count in enumerate(histogram)
+            if count
+        ]
+        if self.export_path.endswith(".csv"):
+            with open(self.export_path, "w", encoding="utf-8", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(("state", "metric", "bucket_ms", "count"))
+                writer.writerows(rows)
+            return
+        data = defaultdict(lambda: defaultdict(dict))
+        for state, metric, bucket, count in rows:
+            data[state][metric][bucket] = count
+        with open(self.export_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4)
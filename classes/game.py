@@ -3,7 +3,13 @@ import pygame
 from classes.file_handler import FileHandler
 from classes.audio_manager import AudioManager
 from classes.state_manager import StateManager
+from classes.renderer import DirtyRectRenderer
+from classes.startup_report import StartupReport
+from classes.frame_profiler import FrameProfiler
+from classes.frame_overlay import FrameOverlay
 from classes.in_game import InGame
+from classes.username_entry import UsernameEntry
+from classes.arena_screen import ArenaScreen
 from classes.menu import (
     MainMenu,
     ModeSelectMenu,
@@ -15,115 +21,266 @@ from classes.menu import (
 from constants.constants import (
     GAME_NAME,
     FPS,
+    CELL_NUM_X,
+    CELL_NUM_Y,
     DISPLAY_WIDTH,
     DISPLAY_HEIGHT,
     BRIGHT_COLOR,
+    DIRTY_RECT_RENDERING,
+    LOW_RESOLUTION_RENDERING,
+    PRELOAD_SCREENS,
 )
 
 
 class Game:
     """Main class responsible for game loop and event checking"""
 
-    def __init__(self):
-        pygame.init()
-        pygame.display.set_caption(GAME_NAME)
+    def __init__(
+        self,
+        replay=None,
+        startup_report=None,
+        board_size=None,
+        frame_stats=None,
+        replay_speed=1,
+        file_handler=None,
+    ):
+        if startup_report is None:
+            startup_report = StartupReport()
+        self.startup_report = startup_report
+        if board_size is None:
+            board_size = (CELL_NUM_X, CELL_NUM_Y)
+        self.board_size = board_size
+        with self.startup_report.measure("Display init"):
+            pygame.init()
+            pygame.display.set_caption(GAME_NAME)
+            # Low resolution frames are scaled up to the window by SDL on present
+            flags = pygame.SCALED | pygame.RESIZABLE if LOW_RESOLUTION_RENDERING else 0
+            self.display = pygame.display.set_mode(
+                (DISPLAY_WIDTH, DISPLAY_HEIGHT), flags
+            )
 
         self.clock = pygame.time.Clock()
         self.fps = FPS
-        self.display = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
         self.display_rect = self.display.get_rect()
         self.display_color = BRIGHT_COLOR
-        self.file_handler = FileHandler()
-        if not self.file_handler.paths_exists():
-            self.file_handler.create_paths()
-        self.audio_manager = AudioManager(self.file_handler)
+        with self.startup_report.measure("Files"):
+            if file_handler is None:
+                file_handler = FileHandler()
+            self.file_handler = file_handler
+            if not self.file_handler.paths_exists():
+                self.file_handler.create_paths()
+        with self.startup_report.measure("Audio"):
+            self.audio_manager = AudioManager(self.file_handler)
+            self.audio_manager.set_volume()
         self.state_manager = StateManager()
-        self.in_game = InGame(
+        self.renderer = DirtyRectRenderer(DIRTY_RECT_RENDERING)
+        # Per phase frame timings, shown with F3 and optionally saved on quit
+        self.profiler = FrameProfiler(self.fps, frame_stats)
+        self.frame_overlay = FrameOverlay(
+            self.display, self.display_rect, self.profiler, self.renderer
+        )
+        # Screens are built on first entry to their state, or ahead of time
+        # during idle frames when PRELOAD_SCREENS is set
+        self.screen_factories = {
+            "In Game": self.create_in_game,
+            "Username Entry": self.create_username_entry,
+            "Arena": self.create_arena,
+            "Main Menu": self.create_main_menu,
+            "Mode Select": self.create_mode_select_menu,
+            "In Game Menu": self.create_in_game_menu,
+            "Leaderboards": self.create_leaderboards_menu,
+            "Options": self.create_options_menu,
+            "Credits": self.create_credits_menu,
+        }
+        self.screens = {}
+        self.drawn_state = None
+        self.state_manager.current_state = "Main Menu"
+        if replay is None:
+            self.audio_manager.play_music("Menu")
+        else:
+            self.in_game.start_replay(replay, replay_speed)
+            self.state_manager.update_state("In Game")
+
+    @property
+    def in_game(self):
+        return self.get_screen("In Game")
+
+    def get_screen(self, state):
+        screen = self.screens.get(state)
+        if screen is None:
+            with self.startup_report.measure(f"Screen: {state}"):
+                screen = self.screen_factories[state]()
+            self.screens[state] = screen
+        return screen
+
+    # Builds one missing screen if last frame left most of its time unused
+    def preload_screen(self):
+        if self.clock.get_rawtime() > 500 // self.fps:
+            return
+        for state in self.screen_factories:
+            if state not in self.screens:
+                self.get_screen(state)
+                return
+
+    def create_in_game(self):
+        return InGame(
             self.display,
             self.display_rect,
             self.file_handler,
             self.audio_manager,
             self.state_manager,
+            self.renderer,
+            self.profiler,
+            self.board_size,
         )
-        self.main_menu = MainMenu(self.display, self.display_rect, self.state_manager)
-        self.mode_select_menu = ModeSelectMenu(
-            self.display, self.display_rect, self.state_manager
+
+    def create_username_entry(self):
+        return UsernameEntry(
+            self.display,
+            self.display_rect,
+            self.file_handler,
+            self.state_manager,
+            self.renderer,
+            self.in_game,
         )
-        self.in_game_menu = InGameMenu(
-            self.display, self.display_rect, self.audio_manager, self.state_manager
+
+    def create_arena(self):
+        return ArenaScreen(
+            self.display,
+            self.display_rect,
+            self.audio_manager,
+            self.state_manager,
+            self.renderer,
+            self.profiler,
+        )
+
+    def create_main_menu(self):
+        return MainMenu(
+            self.display, self.display_rect, self.state_manager, self.renderer
         )
-        self.leaderboards_menu = LeaderboardsMenu(
-            self.display, self.display_rect, self.file_handler, self.state_manager
+
+    def create_mode_select_menu(self):
+        return ModeSelectMenu(
+            self.display, self.display_rect, self.state_manager, self.renderer
         )
-        self.options_menu = OptionsMenu(
+
+    def create_in_game_menu(self):
+        return InGameMenu(
+            self.display,
+            self.display_rect,
+            self.audio_manager,
+            self.state_manager,
+            self.renderer,
+        )
+
+    def create_leaderboards_menu(self):
+        return LeaderboardsMenu(
+            self.display,
+            self.display_rect,
+            self.file_handler,
+            self.state_manager,
+            self.renderer,
+        )
+
+    def create_options_menu(self):
+        return OptionsMenu(
             self.display,
             self.display_rect,
             self.file_handler,
             self.audio_manager,
             self.state_manager,
+            self.renderer,
         )
-        self.credits_menu = CreditsMenu(
+
+    def create_credits_menu(self):
+        return CreditsMenu(
             self.display,
             self.display_rect,
             self.state_manager,
+            self.renderer,
         )
-        self.audio_manager.set_volume()
-        self.audio_manager.menu_music.play(-1)
-        self.state_manager.current_state = "Main Menu"
 
     def start(self):
         while True:
+            self.profiler.begin_frame()
             self.check_events()
-            match self.state_manager.current_state:
+            self.profiler.mark("events")
+            state = self.state_manager.current_state
+            # Screen still shows the previous state, so the new one has to redraw fully
+            if state != self.drawn_state:
+                self.drawn_state = state
+                for screen in self.screens.values():
+                    screen.show()
+            match state:
                 case "In Game":
-                    self.in_game.play()
-                case "Main Menu":
-                    self.main_menu.draw()
-                case "Mode Select":
-                    self.mode_select_menu.draw()
-                case "In Game Menu":
-                    self.in_game_menu.draw()
-                case "Leaderboards":
-                    self.leaderboards_menu.draw()
-                case "Options":
-                    self.options_menu.draw()
-                case "Credits":
-                    self.credits_menu.draw()
+                    self.in_game.play(self.clock.get_time())
+                case "Arena":
+                    self.get_screen(state).play(self.clock.get_time())
+                case _ if state in self.screen_factories:
+                    self.get_screen(state).draw()
                 case _:
                     pass
+            self.frame_overlay.draw()
+            self.profiler.mark("draw")
 
-            pygame.display.update()
+            self.audio_manager.update()
+            self.profiler.mark("update")
+            self.renderer.present()
+            self.profiler.mark("present")
+            self.startup_report.first_frame()
+            if PRELOAD_SCREENS:
+                self.preload_screen()
+            self.profiler.mark("update")
             self.clock.tick(self.fps)
+            self.profiler.mark("tick")
+            self.profiler.end_frame(state)
+
+    # Scaled display keeps its logical size, only the current state has to redraw
+    def toggle_fullscreen(self):
+        pygame.display.toggle_fullscreen()
+        self.drawn_state = None
+        self.renderer.invalidate()
 
     def check_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT or self.state_manager.current_state == "Quit":
+                self.file_handler.close()
+                self.profiler.export()
                 pygame.quit()
                 sys.exit()
-            match self.state_manager.current_state:
+            if (
+                LOW_RESOLUTION_RENDERING
+                and event.type == pygame.KEYDOWN
+                and event.key == pygame.K_F11
+            ):
+                self.toggle_fullscreen()
+                continue
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.frame_overlay.toggle()
+                # Whatever the overlay covered has to be drawn again
+                if not self.frame_overlay.visible:
+                    self.drawn_state = None
+                continue
+            state = self.state_manager.current_state
+            match state:
                 case "In Game":
                     self.in_game.handle_events(event)
-                case "Main Menu":
-                    self.main_menu.handle_events(event)
                 case "Mode Select":
-                    self.mode_select_menu.handle_events(event)
+                    self.get_screen(state).handle_events(event)
                     if self.state_manager.current_state == "Portal Mode":
-                        self.in_game.mode = "Portal"
-                        self.in_game.snake.allow_loop_around = True
+                        self.in_game.set_mode("Portal")
                         self.state_manager.update_state("In Game")
                     elif self.state_manager.current_state == "Wall Mode":
-                        self.in_game.mode = "Wall"
-                        self.in_game.snake.allow_loop_around = False
+                        self.in_game.set_mode("Wall")
                         self.state_manager.update_state("In Game")
+                    elif self.state_manager.current_state == "Arena Mode":
+                        self.get_screen("Arena").reset_game()
+                        self.state_manager.update_state("Arena")
                 case "In Game Menu":
-                    self.in_game_menu.handle_events(event)
+                    self.get_screen(state).handle_events(event)
                     if self.state_manager.current_state == "Main Menu":
                         self.in_game.reset_game()
-                case "Leaderboards":
-                    self.leaderboards_menu.handle_events(event)
-                case "Options":
-                    self.options_menu.handle_events(event)
-                case "Credits":
-                    self.credits_menu.handle_events(event)
+                case _ if state in self.screen_factories:
+                    self.get_screen(state).handle_events(event)
                 case _:
                     pass
@@ -1,271 +1,269 @@
-import sys
+import logging
+import random
 import pygame
-from pygame import Vector2
-from classes.snake import Snake
-from classes.food import Food
-from utils.utils import draw_text, draw_border, tint_display
+from classes.simulation import Simulation
+from classes.replay import Replay
+from classes.sprite_atlas import sprite_atlas
+from classes.board_screen import BoardScreen, DIRECTION_KEYS
 from constants.constants import (
     CELL_NUM_X,
     CELL_NUM_Y,
     CELL_SIZE,
-    DISPLAY_WIDTH,
-    DISPLAY_HEIGHT,
-    DISPLAY_UPDATE,
-    DARK_COLOR,
-    BRIGHT_COLOR,
-    FONT,
-    SMALL_FONT,
-    MEDIUM_FONT,
+    BODY_CELL,
+    INTERPOLATED_RENDERING,
 )
 
+logger = logging.getLogger(__name__)
 
-class InGame:
-    """Gameplay and user registration to leaderboards logic"""
 
-    def __init__(self, surface, rect, file_handler, audio_manager, state_manager):
-        self.surface = surface
-        self.rect = rect
+class InGame(BoardScreen):
+    """Gameplay rendering, input and user registration to leaderboards logic"""
+
+    def __init__(
+        self,
+        surface,
+        rect,
+        file_handler,
+        audio_manager,
+        state_manager,
+        renderer,
+        profiler,
+        board_size=(CELL_NUM_X, CELL_NUM_Y),
+    ):
+        super().__init__(
+            surface,
+            rect,
+            audio_manager,
+            state_manager,
+            renderer,
+            profiler,
+            board_size,
+        )
         self.file_handler = file_handler
-        self.audio_manager = audio_manager
-        self.state_manager = state_manager
-        self.score = 0
-        self.food_eaten = 0
-        self.snake_speed = 300
-        self.snake_speed_increments = 10
-        self.max_snake_speed = 50
-        self.input_buffer = []
-        self.game_active = True
-        self.music_active = False
-        self.timer_active = False
+        # Game rules live in the simulation, this screen only renders it and feeds input
+        self.board_size = board_size
+        self.simulation = Simulation(width=board_size[0], height=board_size[1])
+        self.snake = self.simulation.snake
+        # Inputs of the current run are recorded, a loaded replay is played back instead
+        self.recorder = None
+        self.replay = None
+        self.interpolate = INTERPOLATED_RENDERING
+        self.previous_head = None
+        self.vacated_tail = None
         self.mode = None
-        self.snake = Snake(3, (CELL_NUM_X // 4, CELL_NUM_Y // 2))
-        self.food_items = []
-        self.add_food([1, 5, 10])
-        self.food_items[0].change_position()
-        self.food_group = pygame.sprite.Group()
-        self.food_group.add(self.food_items[0])
+        self.dirty_cells = []
+        self.reset_game()
 
-    def play(self):
+    def play(self, frame_time):
         if self.game_active:
             if not self.music_active:
                 self.music_active = True
-                self.audio_manager.menu_music.stop()
-                self.audio_manager.in_game_music.play(-1)
+                self.audio_manager.play_music("In Game")
 
-            if not self.timer_active:
-                self.enable_timer()
+            self.update(frame_time)
 
-            if self.food_collision():
-                self.audio_manager.eat_sfx.play()
-
-            if self.body_collision():
-                self.audio_manager.in_game_music.stop()
-                self.audio_manager.death1_sfx.play()
+            if self.simulation.done:
+                self.audio_manager.stop_music()
+                if self.simulation.outcome == "Body":
+                    self.audio_manager.death1_sfx.play()
+                elif self.simulation.outcome == "Wall":
+                    self.audio_manager.death2_sfx.play()
                 self.game_over()
                 return
 
-            if self.mode == "Wall":
-                if self.wall_collision():
-                    self.audio_manager.in_game_music.stop()
-                    self.audio_manager.death2_sfx.play()
-                    self.game_over()
-                    return
+            if self.renderer.enabled and not self.full_redraw:
+                self.draw_dirty()
+            else:
+                self.draw()
+        else:
+            # Nothing to submit, so go straight back to main menu
+            self.finish()
+
+    def draw(self):
+        self.surface.blit(self.get_background(), (0, 0))
+        self.draw_score()
+        self.surface.set_clip(self.play_rect)
+        self.draw_snake()
+        self.draw_food()
+        self.surface.set_clip(None)
+        self.dirty_cells.clear()
+        self.full_redraw = False
+        self.renderer.invalidate()
+
+    # Visible rows of the grid are scanned instead of the body, so cost depends on
+    # viewport size rather than snake length
+    def draw_snake(self):
+        body_tile = sprite_atlas.get("body")
+        cells = self.snake.grid.cells
+        head = self.snake.head
+        blits = []
+        for start, end in self.camera.visible_rows():
+            cell = cells.find(BODY_CELL, start, end)
+            while cell != -1:
+                if cell != head:
+                    blits.append((body_tile, self.camera.cell_rect(cell)))
+                cell = cells.find(BODY_CELL, cell + 1, end)
+        self.surface.blits(blits, doreturn=False)
+        self.draw_moving_segments()
 
-            self.surface.fill(BRIGHT_COLOR)
-            draw_border(
-                self.surface,
-                (CELL_SIZE - 2, CELL_SIZE * 3 - 2),
-                CELL_SIZE * (CELL_NUM_X - 2) + 4,
-                CELL_SIZE * (CELL_NUM_Y - 4) + 4,
-                (DARK_COLOR),
-                2,
+    # Head and vacated tail slide between cells when interpolation is enabled
+    def draw_moving_segments(self):
+        if not self.interpolate:
+            self.surface.blit(
+                sprite_atlas.get("head"), self.camera.cell_rect(self.snake.head)
             )
-            draw_text(
-                self.surface,
-                (self.rect.centerx, (CELL_SIZE * 3) // 2),
-                f"Score: {self.score}",
-                FONT,
-                MEDIUM_FONT,
-                (DARK_COLOR),
+            return
+
+        alpha = min(self.accumulator / self.simulation.snake_speed, 1)
+        if self.vacated_tail is not None:
+            self.surface.blit(
+                sprite_atlas.get("body"),
+                self.interpolate_rect(self.vacated_tail, self.snake.body[-1], alpha),
             )
-            self.snake.draw(self.surface)
-            self.food_group.draw(self.surface)
-        else:
-            username = self.get_username(self.surface, self.rect.center)
-            self.file_handler.add_entry(self.mode, username, self.score)
-            self.reset_game()
-            self.state_manager.update_state("Main Menu")
-            self.audio_manager.menu_music.play(-1)
+        self.surface.blit(
+            sprite_atlas.get("head"),
+            self.interpolate_rect(self.previous_head, self.snake.head, alpha),
+        )
 
-    def handle_events(self, event):
-        if event.type == DISPLAY_UPDATE:
-            if self.input_buffer:
-                self.snake.direction = self.input_buffer.pop(0)
-            self.snake.move()
+    def interpolate_rect(self, from_cell, to_cell, alpha):
+        rect = self.camera.cell_rect(to_cell)
+        if from_cell is None:
+            return rect
+        from_rect = self.camera.cell_rect(from_cell)
+        # Don't slide across the board when snake loops around
+        if abs(from_rect.x - rect.x) + abs(from_rect.y - rect.y) != CELL_SIZE:
+            return rect
+        rect.x = round(from_rect.x + (rect.x - from_rect.x) * alpha)
+        rect.y = round(from_rect.y + (rect.y - from_rect.y) * alpha)
+        return rect
 
-        # Allow snake direction change only if it's not opposite of last input
-        if event.type == pygame.KEYDOWN:
-            command_count = len(self.input_buffer)
-            if event.key in (pygame.K_w, pygame.K_UP):
-                if (command_count == 0 and self.snake.direction.y != 1) or (
-                    command_count == 1 and self.input_buffer[0].y != 1
-                ):
-                    self.input_buffer.append(Vector2(0, -1))
-            if event.key in (pygame.K_d, pygame.K_RIGHT):
-                if (command_count == 0 and self.snake.direction.x != -1) or (
-                    command_count == 1 and self.input_buffer[0].x != -1
-                ):
-                    self.input_buffer.append(Vector2(1, 0))
-            if event.key in (pygame.K_s, pygame.K_DOWN):
-                if (command_count == 0 and self.snake.direction.y != -1) or (
-                    command_count == 1 and self.input_buffer[0].y != -1
-                ):
-                    self.input_buffer.append(Vector2(0, 1))
-            if event.key in (pygame.K_a, pygame.K_LEFT):
-                if (command_count == 0 and self.snake.direction.x != 1) or (
-                    command_count == 1 and self.input_buffer[0].x != 1
-                ):
-                    self.input_buffer.append(Vector2(-1, 0))
-            if event.key == pygame.K_ESCAPE:
-                self.disable_timer()
-                self.state_manager.update_state("In Game Menu")
+    def draw_food(self):
+        food = self.simulation.food
+        if food.cell is not None and self.camera.is_visible(food.cell):
+            food_tile = sprite_atlas.get(f"food_{food.value}")
+            self.surface.blit(food_tile, self.camera.cell_rect(food.cell))
 
-    def get_username(self, surface, pos):
-        message_text = "Enter your username"
-        input_text = ""
+    def get_score_text(self):
+        return f"Score: {self.simulation.score}"
 
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.KEYDOWN:
-                    length = len(input_text)
-                    if event.key == pygame.K_RETURN:
-                        if length < 3:
-                            message_text = "A minimum of 3 characters are required"
-                        elif not input_text.isalnum():
-                            message_text = "Only alphanumeric characters are allowed"
-                        else:
-                            return input_text
-                    elif event.key == pygame.K_BACKSPACE:
-                        input_text = input_text[:-1]
-                    else:
-                        if length < 16:
-                            input_text += event.unicode
+    # Repaint only cells that changed since the last frame instead of the whole display
+    def draw_dirty(self):
+        if self.score_changed():
+            self.draw_score()
+            self.renderer.mark_rect(self.score_rect)
 
-            text_surface = pygame.Surface(
-                (self.rect.width // 1.5, self.rect.height // 4)
-            )
-            text_surface.fill(BRIGHT_COLOR)
-            text_rect = text_surface.get_rect(center=pos)
-            draw_border(
-                text_surface, (0, 0), text_rect.width, text_rect.height, DARK_COLOR, 2
-            )
-            draw_text(
-                text_surface,
-                (text_rect.width // 2, SMALL_FONT),
-                message_text,
-                FONT,
-                SMALL_FONT,
-                DARK_COLOR,
-            )
-            draw_text(
-                text_surface,
-                (text_rect.width // 2, text_rect.height // 2),
-                input_text + "_" if len(input_text) < 16 else input_text,
-                FONT,
-                MEDIUM_FONT,
-                DARK_COLOR,
-            )
-            draw_text(
-                text_surface,
-                (text_rect.width // 2, text_rect.height - SMALL_FONT),
-                "Press ENTER to continue",
-                FONT,
-                SMALL_FONT,
-                DARK_COLOR,
-            )
-            surface.blit(text_surface, text_rect)
-            pygame.display.update()
+        dirty_cells = set(self.dirty_cells)
+        if self.interpolate:
+            dirty_cells.update(self.get_moving_cells())
+        dirty_cells = [cell for cell in dirty_cells if self.camera.is_visible(cell)]
+        if not dirty_cells:
+            self.dirty_cells.clear()
+            return
+        background = self.get_background()
+        self.surface.set_clip(self.play_rect)
+        for cell in dirty_cells:
+            dirty_rect = self.camera.cell_rect(cell)
+            self.surface.blit(background, dirty_rect, dirty_rect)
+            self.renderer.mark_rect(dirty_rect)
 
-    def add_food(self, values):
-        for value in values:
-            self.food_items.append(Food(self.snake, value))
+        # Occupancy grid tells what has to be drawn on each dirty cell
+        grid = self.snake.grid
+        for cell in dirty_cells:
+            if cell == self.snake.head:
+                continue
+            if grid.is_body(cell):
+                self.surface.blit(sprite_atlas.get("body"), self.camera.cell_rect(cell))
+            elif grid.is_food(cell):
+                self.draw_food()
+        self.draw_moving_segments()
+        self.surface.set_clip(None)
+        self.dirty_cells.clear()
 
-    def change_food(self):
-        # Change currently displayed food based on number of food items eaten so far
-        if self.food_eaten % 10 == 0:
-            self.food_items[2].change_position()
-            self.food_group.add(self.food_items[2])
-        elif self.food_eaten % 5 == 0:
-            self.food_items[1].change_position()
-            self.food_group.add(self.food_items[1])
-        else:
-            self.food_items[0].change_position()
-            self.food_group.add(self.food_items[0])
+    def get_moving_cells(self):
+        cells = [self.snake.head, self.snake.body[-1]]
+        if self.previous_head is not None:
+            cells.append(self.previous_head)
+        if self.vacated_tail is not None:
+            cells.append(self.vacated_tail)
+        return cells
+
+    def get_tick_length(self):
+        return self.simulation.snake_speed
 
-    def food_collision(self):
-        if pygame.sprite.spritecollide(self.snake.head.sprite, self.food_group, False):
-            self.snake.add_segment()
-            # Make sure that snake speed doesn't exceed maximum at any time and update it when needed
-            if self.snake_speed > self.max_snake_speed:
-                self.snake_speed -= self.snake_speed_increments
-                self.update_timer()
-            collided_food = pygame.sprite.spritecollide(
-                self.snake.head.sprite, self.food_group, False
-            )[0]
-            self.score += collided_food.value
-            self.food_eaten += 1
-            self.food_group.remove(collided_food)
-            self.change_food()
-            return True
-        return False
+    def is_done(self):
+        return self.simulation.done
 
-    def body_collision(self):
-        if pygame.sprite.spritecollide(self.snake.head.sprite, self.snake.body, False):
-            return True
-        return False
+    def tick(self):
+        if self.replay is not None:
+            direction = self.replay.next_action()
+        else:
+            direction = self.input_queue.pop(pygame.time.get_ticks())
+        self.step(direction)
 
-    def wall_collision(self):
-        if (
-            self.snake.head.sprite.pos.x < 1
-            or self.snake.head.sprite.pos.x > CELL_NUM_X - 2
-            or self.snake.head.sprite.pos.y < 3
-            or self.snake.head.sprite.pos.y > CELL_NUM_Y - 2
-        ):
-            return True
-        return False
+    def handle_events(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key in DIRECTION_KEYS and self.replay is None:
+                self.input_queue.push(
+                    DIRECTION_KEYS[event.key],
+                    self.snake.direction,
+                    pygame.time.get_ticks(),
+                )
+            if event.key == pygame.K_ESCAPE:
+                self.state_manager.update_state("In Game Menu")
 
-    def reset_game(self):
-        self.score = 0
-        self.food_eaten = 0
-        self.snake_speed = 300
-        self.input_buffer = []
-        self.game_active = True
-        self.music_active = False
-        self.snake.reset()
-        self.food_items[0].change_position()
-        self.food_group.empty()
-        self.food_group.add(self.food_items[0])
+    def step(self, direction):
+        if self.simulation.done:
+            return
+        # Cells touched by the move: old head, new head, old tail and possibly food
+        head = self.snake.head
+        tail = self.snake.body[-1]
+        food_cell = self.simulation.food.cell
+        self.recorder.record(direction)
+        _, reward, _ = self.simulation.step(direction)
+        self.dirty_cells.extend((head, tail, self.snake.head, self.snake.body[-1]))
+        # Cells that sliding segments covered before this tick have to be cleaned up too
+        if self.interpolate:
+            self.dirty_cells.extend(self.get_moving_cells())
+        self.previous_head = head
+        self.vacated_tail = tail if tail != self.snake.body[-1] else None
+        # Scrolling shifts every visible cell, so the whole viewport is redrawn
+        if self.camera.follow(self.snake.head):
+            self.full_redraw = True
+        if reward:
+            self.audio_manager.eat_sfx.play()
+            if self.simulation.food.cell is not None:
+                self.dirty_cells.extend((food_cell, self.simulation.food.cell))
 
-    def game_over(self):
-        self.game_active = False
-        self.disable_timer()
-        tint_display(
-            self.surface,
-            DISPLAY_WIDTH,
-            DISPLAY_HEIGHT,
-            (128, 128, 128),
-        )
+    def set_mode(self, mode):
+        self.mode = mode
+        self.simulation.set_mode(mode)
+        self.recorder.mode = mode
 
-    def enable_timer(self):
-        pygame.time.set_timer(DISPLAY_UPDATE, self.snake_speed)
-        self.timer_active = True
+    # Every run gets its own seed so that it can be reproduced from a replay
+    def reset_game(self, seed=None):
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.reset_screen()
+        self.previous_head = None
+        self.vacated_tail = None
+        self.replay = None
+        self.playback_speed = 1
+        self.recorder = Replay(self.mode, seed)
+        self.simulation.reset(seed)
+        self.camera.center(self.snake.head)
 
-    def disable_timer(self):
-        pygame.time.set_timer(DISPLAY_UPDATE, 0)
-        self.timer_active = False
+    def start_replay(self, replay, speed=1):
+        self.set_mode(replay.mode)
+        self.reset_game(replay.seed)
+        replay.rewind()
+        self.replay = replay
+        self.playback_speed = speed
 
-    def update_timer(self):
-        pygame.time.set_timer(DISPLAY_UPDATE, self.snake_speed)
+    def game_over(self):
+        self.game_active = False
+        logger.info("Input latency (ms): %s", self.input_queue.get_stats())
+        self.draw()
+        self.tint()
+        # Runs on custom board sizes aren't comparable, so they skip leaderboards
+        if self.replay is None and self.board_size == (CELL_NUM_X, CELL_NUM_Y):
+            self.state_manager.update_state("Username Entry")
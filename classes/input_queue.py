@@ -0,0 +1,47 @@
+from collections import deque
+
+
+class InputQueue:
+    """Fixed capacity queue of direction inputs with key press timestamps"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.entries = deque()
+        # Milliseconds between key press and the tick that applied it, per session
+        self.latencies = []
+
+    def __len__(self):
+        return len(self.entries)
+
+    # Allow direction change only if it's not opposite of the last queued input
+    def push(self, direction, current_direction, timestamp):
+        if len(self.entries) == self.capacity:
+            return False
+        last_direction = self.entries[-1][0] if self.entries else current_direction
+        if direction == (-last_direction[0], -last_direction[1]):
+            return False
+        self.entries.append((direction, timestamp))
+        return True
+
+    def pop(self, timestamp):
+        if not self.entries:
+            return None
+        direction, pressed = self.entries.popleft()
+        self.latencies.append(timestamp - pressed)
+        return direction
+
+    def clear(self):
+        self.entries.clear()
+        self.latencies = []
+
+    def get_stats(self):
+        if not self.latencies:
+            return {"count": 0, "p50": None, "p95": None, "max": None}
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        return {
+            "count": count,
+            "p50": latencies[(count - 1) * 50 // 100],
+            "p95": latencies[(count - 1) * 95 // 100],
+            "max": latencies[-1],
+        }
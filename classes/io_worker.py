@@ -0,0 +1,73 @@
+import copy
+import json
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+
+def write_atomic(path, data):
+    # Readers see either the old file or the new one, never a partial write
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    # Rename only survives power loss once its directory is synced
+    if hasattr(os, "O_DIRECTORY"):
+        directory = os.open(os.path.dirname(path) or ".", os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+
+class IOWorker:
+    """Single thread running file jobs in submission order, results as futures"""
+
+    def __init__(self):
+        self.jobs = queue.Queue()
+        # path: ((mtime, size), data) of files read through read_json
+        self.cache = {}
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, function, *args):
+        future = Future()
+        self.jobs.put((future, function, args))
+        return future
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            future, function, args = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            # Errors are left to whoever waits on the future to report
+            try:
+                future.set_result(function(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+    def read_json(self, path):
+        return self.submit(self.load_json, path)
+
+    # Functions below run on the worker thread
+
+    def load_json(self, path):
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self.cache.get(path)
+        if cached is None or cached[0] != key:
+            with open(path, "r", encoding="utf-8") as file:
+                cached = (key, json.load(file))
+            self.cache[path] = cached
+        return copy.deepcopy(cached[1])
+
+    # Finishes queued jobs before returning
+    def close(self):
+        self.jobs.put(None)
+        self.thread.join()
@@ -0,0 +1,107 @@
+import os
+import sqlite3
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    mode TEXT NOT NULL,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    replay TEXT
+);
+CREATE INDEX IF NOT EXISTS scores_mode_score ON scores (mode, score DESC);
+CREATE INDEX IF NOT EXISTS scores_mode_replay ON scores (mode, score DESC)
+    WHERE replay IS NOT NULL;
+CREATE TABLE IF NOT EXISTS migrations (file_name TEXT PRIMARY KEY);
+"""
+
+
+class LeaderboardStore:
+    """Full score history in SQLite, top N of a mode is read through its index"""
+
+    def __init__(self, path):
+        self.path = path
+        # Entries are added from a background thread, so access is serialized
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def top(self, mode, limit=10, offset=0):
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT name, score, date, replay FROM scores WHERE mode = ? "
+                "ORDER BY score DESC, id LIMIT ? OFFSET ?",
+                (mode, limit, offset),
+            ).fetchall()
+        return [self.to_entry(row) for row in rows]
+
+    def add(self, mode, entry):
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT INTO scores (mode, name, score, date, replay) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    mode,
+                    entry["name"],
+                    entry["score"],
+                    entry["date"],
+                    entry.get("replay"),
+                ),
+            )
+
+    # Returns replays of entries ranked below limit and forgets them, only entries
+    # that still hold a replay are visited, so cost doesn't grow with history
+    def release_replays(self, mode, limit=10):
+        with self.lock, self.connection:
+            rows = self.connection.execute(
+                "SELECT id, replay FROM scores INDEXED BY scores_mode_replay "
+                "WHERE mode = ? AND replay IS NOT NULL AND id NOT IN ("
+                "SELECT id FROM scores WHERE mode = ? "
+                "ORDER BY score DESC, id LIMIT ?)",
+                (mode, mode, limit),
+            ).fetchall()
+            self.connection.executemany(
+                "UPDATE scores SET replay = NULL WHERE id = ?",
+                [(row["id"],) for row in rows],
+            )
+        return [row["replay"] for row in rows]
+
+    # Imports a legacy JSON leaderboard once, later calls are no-ops
+    def migrate_json(self, mode, path, load_json):
+        file_name = os.path.basename(path)
+        if not os.path.exists(path):
+            return 0
+        with self.lock, self.connection:
+            if self.connection.execute(
+                "SELECT 1 FROM migrations WHERE file_name = ?", (file_name,)
+            ).fetchone():
+                return 0
+            data = load_json(path)
+            self.connection.executemany(
+                "INSERT INTO scores (mode, name, score, date, replay) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (mode, e["name"], e["score"], e["date"], e.get("replay"))
+                    for e in data
+                ],
+            )
+            self.connection.execute(
+                "INSERT INTO migrations (file_name) VALUES (?)", (file_name,)
+            )
+        return len(data)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    @staticmethod
+    def to_entry(row):
+        entry = {"name": row["name"], "score": row["score"], "date": row["date"]}
+        if row["replay"] is not None:
+            entry["replay"] = row["replay"]
+        return entry
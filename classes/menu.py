@@ -11,10 +11,15 @@ from constants.constants import (
 
 # Parent class that serves as blueprint for the rest of menus
 class Menu:
-    def __init__(self, surface, rect, state_manager):
+    def __init__(self, surface, rect, state_manager, renderer):
         self.surface = surface
         self.rect = rect
         self.state_manager = state_manager
+        self.renderer = renderer
+        # Menus are retained: the composed frame is reused until its view state changes
+        self.frame = pygame.Surface(rect.size)
+        self.drawn_view_state = None
+        self.presented = False
         self.center_x_pos = rect.center[0]
         self.center_y_pos = rect.center[1]
         self.btn_height = self.rect.height // 10
@@ -29,7 +34,19 @@ class Menu:
         self.selected = 0
 
     def draw(self):
-        self.surface.fill(self.background_color)
+        view_state = self.get_view_state()
+        if view_state != self.drawn_view_state:
+            self.compose()
+            self.drawn_view_state = view_state
+            self.presented = False
+        # Frame is unchanged and already on screen, so skip drawing and presenting
+        if not self.presented:
+            self.surface.blit(self.frame, self.rect)
+            self.renderer.invalidate()
+            self.presented = True
+
+    def compose(self):
+        self.frame.fill(self.background_color)
         for i, button in enumerate(self.buttons):
             if self.selected == i:
                 button.selected = True
@@ -37,6 +54,16 @@ class Menu:
                 button.selected = False
             button.draw()
 
+    def get_view_state(self):
+        return (self.selected,)
+
+    # Frame has to be presented again once another screen has drawn over it
+    def show(self):
+        self.presented = False
+
+    def invalidate(self):
+        self.drawn_view_state = None
+
     # Allow menu navigation by keeping track of currently selected item
     def handle_events(self, event):
         if event.type == pygame.KEYDOWN:
@@ -52,7 +79,7 @@ class Menu:
         start_y = (self.rect.height - total_buttons_height) // 2
         for i, option in enumerate(self.options):
             btn = Button(
-                self.surface,
+                self.frame,
                 (self.center_x_pos, start_y + (self.btn_height + spacing) * i),
                 self.btn_width,
                 self.btn_height,
@@ -67,8 +94,8 @@ class Menu:
 
 
 class MainMenu(Menu):
-    def __init__(self, surface, rect, state_manager):
-        super().__init__(surface, rect, state_manager)
+    def __init__(self, surface, rect, state_manager, renderer):
+        super().__init__(surface, rect, state_manager, renderer)
         self.options = ["Play", "Leaderboards", "Options", "Credits", "Quit"]
         self.create_buttons()
 
@@ -87,9 +114,9 @@ class MainMenu(Menu):
 
 
 class ModeSelectMenu(Menu):
-    def __init__(self, surface, rect, state_manager):
-        super().__init__(surface, rect, state_manager)
-        self.options = ["Portal Mode", "Wall Mode", "Back"]
+    def __init__(self, surface, rect, state_manager, renderer):
+        super().__init__(surface, rect, state_manager, renderer)
+        self.options = ["Portal Mode", "Wall Mode", "Arena Mode", "Back"]
         self.create_buttons()
 
     def handle_events(self, event):
@@ -111,8 +138,8 @@ class ModeSelectMenu(Menu):
 
 
 class InGameMenu(Menu):
-    def __init__(self, surface, rect, audio_manager, state_manager):
-        super().__init__(surface, rect, state_manager)
+    def __init__(self, surface, rect, audio_manager, state_manager, renderer):
+        super().__init__(surface, rect, state_manager, renderer)
         self.audio_manager = audio_manager
         self.options = ["Resume", "Leaderboards", "Options", "Main Menu"]
         self.create_buttons()
@@ -131,37 +158,49 @@ class InGameMenu(Menu):
         if state == "Resume":
             state = "In Game"
         if state == "Main Menu":
-            self.audio_manager.in_game_music.stop()
-            self.audio_manager.menu_music.play(-1)
+            self.audio_manager.play_music("Menu")
         self.selected = 0
         return state
 
 
 class LeaderboardsMenu(Menu):
-    def __init__(self, surface, rect, file_handler, state_manager):
-        super().__init__(surface, rect, state_manager)
+    def __init__(self, surface, rect, file_handler, state_manager, renderer):
+        super().__init__(surface, rect, state_manager, renderer)
         self.file_handler = file_handler
         self.btn_width = self.rect.width // 4
-        self.portal_mode_leaderboard = None
-        self.wall_mode_leaderboard = None
+        self.portal_mode_leaderboard = []
+        self.wall_mode_leaderboard = []
+        self.requests = None
         self.loaded = False
+        self.data_version = 0
         self.previously_selected = 0
         self.options = ["Portal Mode", "Wall Mode", "Back"]
         self.create_buttons()
 
     def draw(self):
-        self.surface.fill(self.background_color)
-        for i, button in enumerate(self.buttons):
-            if self.selected == i:
-                button.selected = True
-            else:
-                button.selected = False
-            button.draw()
-
         # When leaderboards are opened load up data only once
         if not self.loaded:
             self.get_leaderboards()
+        super().draw()
 
+    def get_leaderboards(self):
+        # Queries run on the I/O worker, until they finish old data is shown
+        if self.requests is None:
+            self.requests = (
+                self.file_handler.request_data("Portal"),
+                self.file_handler.request_data("Wall"),
+            )
+        if not all(request.done() for request in self.requests):
+            return
+        portal_request, wall_request = self.requests
+        self.portal_mode_leaderboard = portal_request.result()
+        self.wall_mode_leaderboard = wall_request.result()
+        self.requests = None
+        self.data_version += 1
+        self.loaded = True
+
+    def compose(self):
+        super().compose()
         if self.selected == 0:
             self.draw_leaderboards("Portal")
         elif self.selected == 1:
@@ -197,7 +236,7 @@ class LeaderboardsMenu(Menu):
         start_x = (self.rect.width - total_buttons_width) // 2
         for i, option in enumerate(self.options):
             btn = Button(
-                self.surface,
+                self.frame,
                 (
                     start_x + (self.btn_width + spacing) * i,
                     self.rect.bottom - (MEDIUM_FONT + (self.btn_height // 2)),
@@ -226,9 +265,10 @@ class LeaderboardsMenu(Menu):
             leaderboard = self.wall_mode_leaderboard
 
         for i, entry in enumerate(leaderboard):
-            divisor = len(entry) + 1
+            # Name, score and date columns, extra keys like replay are not shown
+            divisor = 4
             draw_text(
-                self.surface,
+                self.frame,
                 (
                     (self.rect.width // divisor),
                     self.btn_height + ((self.btn_height // 1.4) * i),
@@ -240,7 +280,7 @@ class LeaderboardsMenu(Menu):
             )
             for j, key in enumerate(["name", "score"]):
                 draw_text(
-                    self.surface,
+                    self.frame,
                     (
                         (self.rect.width / divisor)
                         + (self.rect.width / divisor) * (j + 1),
@@ -252,15 +292,15 @@ class LeaderboardsMenu(Menu):
                     self.text_base_color,
                 )
 
-    def get_leaderboards(self):
-        self.portal_mode_leaderboard = self.file_handler.get_data("Portal")
-        self.wall_mode_leaderboard = self.file_handler.get_data("Wall")
-        self.loaded = True
+    def get_view_state(self):
+        return (self.selected, self.previously_selected, self.data_version)
 
 
 class OptionsMenu(Menu):
-    def __init__(self, surface, rect, file_handler, audio_manager, state_manager):
-        super().__init__(surface, rect, state_manager)
+    def __init__(
+        self, surface, rect, file_handler, audio_manager, state_manager, renderer
+    ):
+        super().__init__(surface, rect, state_manager, renderer)
         self.file_handler = file_handler
         self.audio_manager = audio_manager
         self.options = ["Music volume", "SFX volume", "Back"]
@@ -269,8 +309,8 @@ class OptionsMenu(Menu):
         self.create_buttons(self.btn_height * 1.5)
         self.create_sliders()
 
-    def draw(self):
-        super().draw()
+    def compose(self):
+        super().compose()
         for i, slider in enumerate(self.sliders):
             if self.selected == i:
                 slider.selected = True
@@ -309,6 +349,13 @@ class OptionsMenu(Menu):
         self.selected = 0
         return state
 
+    def get_view_state(self):
+        return (
+            self.selected,
+            self.audio_manager.music_volume,
+            self.audio_manager.sfx_volume,
+        )
+
     def change_volume(self, adjustment, audio_type, slider):
         if adjustment == "increase":
             if audio_type == "Music":
@@ -327,7 +374,7 @@ class OptionsMenu(Menu):
 
     def create_sliders(self):
         music_slider = Slider(
-            self.surface,
+            self.frame,
             (self.rect.centerx, self.buttons[0].rect.bottom + self.btn_height // 2),
             self.rect.width // 3,
             MEDIUM_FONT // 2,
@@ -336,7 +383,7 @@ class OptionsMenu(Menu):
             MEDIUM_COLOR,
         )
         sfx_slider = Slider(
-            self.surface,
+            self.frame,
             (self.rect.centerx, self.buttons[1].rect.bottom + self.btn_height // 2),
             self.rect.width // 3,
             MEDIUM_FONT // 2,
@@ -350,25 +397,21 @@ class OptionsMenu(Menu):
         self.sliders.append(sfx_slider)
 
     def adjust_slider(self, audio_type, slider):
-        settings = self.file_handler.read(self.file_handler.settings_file_name)
-        if audio_type == "Music":
-            volume = settings[0]["music_volume"]
-        else:
-            volume = settings[0]["sfx_volume"]
+        volume = self.file_handler.get_volume(audio_type)
         slider.thumb_rect.centerx = (
             slider.track_rect.left + (slider.width / 100) * volume
         )
 
 
 class CreditsMenu(Menu):
-    def __init__(self, surface, rect, state_manager):
-        super().__init__(surface, rect, state_manager)
+    def __init__(self, surface, rect, state_manager, renderer):
+        super().__init__(surface, rect, state_manager, renderer)
         self.options = ["Back"]
         self.song_names = []
         self.create_buttons()
 
-    def draw(self):
-        super().draw()
+    def compose(self):
+        super().compose()
         self.draw_credits()
 
     def handle_events(self, event):
@@ -386,7 +429,7 @@ class CreditsMenu(Menu):
         start_y = self.rect.bottom - (MEDIUM_FONT + self.btn_height)
         for option in self.options:
             btn = Button(
-                self.surface,
+                self.frame,
                 (self.center_x_pos, start_y),
                 self.btn_width,
                 self.btn_height,
@@ -409,7 +452,7 @@ class CreditsMenu(Menu):
         start_y = available_height // 4
 
         draw_text(
-            self.surface,
+            self.frame,
             (self.rect.centerx, start_y - MEDIUM_FONT),
             "Programmed by Inokus",
             FONT,
@@ -417,7 +460,7 @@ class CreditsMenu(Menu):
             DARK_COLOR,
         )
         draw_text(
-            self.surface,
+            self.frame,
             (self.rect.centerx, start_y * 2 - MEDIUM_FONT * 2),
             "Music by Abstraction :",
             FONT,
@@ -425,7 +468,7 @@ class CreditsMenu(Menu):
             DARK_COLOR,
         )
         draw_text(
-            self.surface,
+            self.frame,
             (self.rect.centerx, start_y * 2),
             "(abstractionmusic.com)",
             FONT,
@@ -433,7 +476,7 @@ class CreditsMenu(Menu):
             DARK_COLOR,
         )
         draw_text(
-            self.surface,
+            self.frame,
             (self.rect.centerx, start_y * 2 + MEDIUM_FONT * 2),
             "Ludum Dare 30 - Track 6",
             FONT,
@@ -441,7 +484,7 @@ class CreditsMenu(Menu):
             MEDIUM_COLOR,
         )
         draw_text(
-            self.surface,
+            self.frame,
             (self.rect.centerx, start_y * 2 + MEDIUM_FONT * 4),
             "Ludum Dare 38 - Track 2",
             FONT,
@@ -449,7 +492,7 @@ class CreditsMenu(Menu):
             MEDIUM_COLOR,
         )
         draw_text(
-            self.surface,
+            self.frame,
             (self.rect.centerx, start_y * 3 + MEDIUM_FONT * 3),
             "SFX by OmegaPixelArt",
             FONT,
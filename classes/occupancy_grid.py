@@ -0,0 +1,136 @@
+from array import array
+import random
+from constants.constants import (
+    EMPTY_CELL,
+    BODY_CELL,
+    WALL_CELL,
+    FOOD_CELL,
+    FREE_INDEX_MAX_CELLS,
+    FREE_CELL_SAMPLES,
+)
+
+
+# Portal rule: leaving the play area enters it again from the opposite side
+def wrap_position(x, y, width, height):
+    if x < 1:
+        x = width - 2
+    if x > width - 2:
+        x = 1
+    if y < 3:
+        y = height - 2
+    if y > height - 2:
+        y = 3
+    return (x, y)
+
+
+class OccupancyGrid:
+    """Board contents indexed by packed cell, answers what occupies a cell in O(1)"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.cells = bytearray(self.create_layout())
+        self.free_count = 0
+        # Empty cells are listed with a reverse index for O(1) removal and sampling,
+        # arrays keep that at 4 bytes per cell, and it's only built when needed
+        self.free_cells = None
+        self.free_slots = None
+        self.reset()
+
+    def create_layout(self):
+        width, height = self.width, self.height
+        # Outer columns, bottom row and the score header rows are walls
+        wall, empty = bytes([WALL_CELL]), bytes([EMPTY_CELL])
+        row = wall + empty * (width - 2) + wall
+        return wall * width * 3 + row * (height - 4) + wall * width
+
+    def reset(self):
+        self.cells[:] = self.create_layout()
+        self.free_count = (self.width - 2) * (self.height - 4)
+        self.free_cells = None
+        self.free_slots = None
+        if len(self.cells) <= FREE_INDEX_MAX_CELLS:
+            self.build_free_index()
+
+    # Lists empty cells in board order, so sampling stays reproducible from a seed
+    def build_free_index(self):
+        cells = self.cells
+        free_cells = array("i")
+        free_slots = array("i", [-1]) * len(cells)
+        cell = cells.find(EMPTY_CELL)
+        while cell != -1:
+            free_slots[cell] = len(free_cells)
+            free_cells.append(cell)
+            cell = cells.find(EMPTY_CELL, cell + 1)
+        self.free_cells = free_cells
+        self.free_slots = free_slots
+
+    def pack(self, x, y):
+        return int(y) * self.width + int(x)
+
+    def unpack(self, cell):
+        y, x = divmod(cell, self.width)
+        return (x, y)
+
+    def wrap(self, x, y):
+        return wrap_position(x, y, self.width, self.height)
+
+    def get(self, cell):
+        if 0 <= cell < len(self.cells):
+            return self.cells[cell]
+        return WALL_CELL
+
+    def set(self, cell, content):
+        previous = self.cells[cell]
+        self.cells[cell] = content
+        if previous == EMPTY_CELL and content != EMPTY_CELL:
+            self.free_count -= 1
+            if self.free_cells is not None:
+                self.remove_free(cell)
+        elif previous != EMPTY_CELL and content == EMPTY_CELL:
+            self.free_count += 1
+            if self.free_cells is not None:
+                self.add_free(cell)
+
+    # Only clear the cell if it still holds given content, so walls stay intact
+    def clear(self, cell, content):
+        if self.get(cell) == content:
+            self.set(cell, EMPTY_CELL)
+
+    def add_free(self, cell):
+        self.free_slots[cell] = len(self.free_cells)
+        self.free_cells.append(cell)
+
+    # Swap with the last free cell so removal doesn't shift the list
+    def remove_free(self, cell):
+        slot = self.free_slots[cell]
+        last_cell = self.free_cells.pop()
+        if last_cell != cell:
+            self.free_cells[slot] = last_cell
+            self.free_slots[last_cell] = slot
+        self.free_slots[cell] = -1
+
+    # Uniformly pick an empty cell, None means that the board is full
+    def random_free_cell(self, rng=random):
+        if not self.free_count:
+            return None
+        if self.free_cells is None:
+            # Mostly empty large board, a random cell is likely to be free
+            for _ in range(FREE_CELL_SAMPLES):
+                cell = rng.randrange(len(self.cells))
+                if self.cells[cell] == EMPTY_CELL:
+                    return cell
+            self.build_free_index()
+        return self.free_cells[rng.randrange(len(self.free_cells))]
+
+    def is_empty(self, cell):
+        return self.get(cell) == EMPTY_CELL
+
+    def is_body(self, cell):
+        return self.get(cell) == BODY_CELL
+
+    def is_wall(self, cell):
+        return self.get(cell) == WALL_CELL
+
+    def is_food(self, cell):
+        return self.get(cell) == FOOD_CELL
@@ -0,0 +1,25 @@
+import pygame
+
+
+class DirtyRectRenderer:
+    """Keeps track of changed screen areas and presents only those"""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.full_redraw = True
+        self.dirty_rects = []
+
+    def mark_rect(self, rect):
+        self.dirty_rects.append(pygame.Rect(rect))
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def present(self):
+        if not self.enabled or self.full_redraw:
+            pygame.display.update()
+        elif self.dirty_rects:
+            pygame.display.update(self.dirty_rects)
+
+        self.full_redraw = False
+        self.dirty_rects.clear()
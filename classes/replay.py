@@ -0,0 +1,74 @@
+import struct
+from classes.simulation import Simulation
+
+# Each tick is stored as one byte: an index into ACTIONS or NO_ACTION
+ACTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+NO_ACTION = len(ACTIONS)
+MODES = ("Portal", "Wall")
+HEADER = struct.Struct("<4sBBQII")
+MAGIC = b"PYRP"
+VERSION = 1
+
+
+class Replay:
+    """Seed plus one byte of input per tick, enough to reproduce a whole run"""
+
+    def __init__(self, mode, seed, actions=b"", score=0):
+        self.mode = mode
+        self.seed = seed
+        self.actions = bytearray(actions)
+        self.score = score
+        self.position = 0
+
+    def record(self, direction):
+        if direction is None:
+            self.actions.append(NO_ACTION)
+        else:
+            self.actions.append(ACTIONS.index(direction))
+
+    def next_action(self):
+        if self.finished():
+            return None
+        action = self.actions[self.position]
+        self.position += 1
+        if action == NO_ACTION:
+            return None
+        return ACTIONS[action]
+
+    def finished(self):
+        return self.position >= len(self.actions)
+
+    def rewind(self):
+        self.position = 0
+
+    # Play every recorded tick as fast as possible and return finished simulation
+    def verify(self):
+        simulation = Simulation(self.mode)
+        simulation.reset(self.seed)
+        for action in self.actions:
+            simulation.step(None if action == NO_ACTION else ACTIONS[action])
+        return simulation
+
+    def to_bytes(self):
+        header = HEADER.pack(
+            MAGIC,
+            VERSION,
+            MODES.index(self.mode),
+            self.seed,
+            self.score,
+            len(self.actions),
+        )
+        return header + bytes(self.actions)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, mode, seed, score, ticks = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a supported replay file")
+        actions = data[HEADER.size : HEADER.size + ticks]
+        return cls(MODES[mode], seed, actions, score)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
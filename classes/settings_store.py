@@ -0,0 +1,81 @@
+import copy
+import json
+import logging
+import threading
+import time
+from classes.io_worker import write_atomic
+
+logger = logging.getLogger(__name__)
+
+
+class SettingsStore:
+    """In-memory settings, changes are coalesced into one background write"""
+
+    def __init__(self, path, data, delay=0.5):
+        self.path = path
+        self.delay = delay
+        self.data = copy.deepcopy(data)
+        self.condition = threading.Condition()
+        # Writes are serialized apart from the condition, so that get and set on
+        # the UI thread never wait on the filesystem
+        self.write_lock = threading.Lock()
+        self.dirty = False
+        self.changed_at = 0.0
+        self.running = True
+        self.thread = None
+
+    def get(self, key):
+        with self.condition:
+            return self.data[0][key]
+
+    def set(self, key, value):
+        with self.condition:
+            if self.data[0].get(key) == value:
+                return
+            self.data[0][key] = value
+            self.dirty = True
+            self.changed_at = time.monotonic()
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.running:
+                    if not self.dirty:
+                        self.condition.wait()
+                        continue
+                    # Keep waiting while changes keep coming in
+                    remaining = self.changed_at + self.delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                if not self.running:
+                    return
+            self.commit()
+
+    # Snapshot is taken under the condition, the slow write happens outside of it
+    def commit(self):
+        with self.write_lock:
+            with self.condition:
+                if not self.dirty:
+                    return
+                data = json.dumps(self.data, indent=4)
+                self.dirty = False
+            try:
+                write_atomic(self.path, data.encode("utf-8"))
+            except OSError as e:
+                logger.error("Could not save settings: %s", e)
+
+    def flush(self):
+        self.commit()
+
+    def close(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join()
+        self.flush()
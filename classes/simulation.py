@@ -0,0 +1,113 @@
+import random
+from classes.snake import Snake
+from classes.food import Food
+from constants.constants import CELL_NUM_X, CELL_NUM_Y
+
+
+class Simulation:
+    """Game rules working on plain data, runs without pygame or a display"""
+
+    def __init__(self, mode="Portal", seed=None, width=CELL_NUM_X, height=CELL_NUM_Y):
+        self.mode = mode
+        # Board can be larger than the display, screens then follow snake head
+        self.width = width
+        self.height = height
+        self.snake = Snake(3, (width // 4, height // 2), width, height)
+        self.food_items = [Food(self.snake.grid, value) for value in (1, 5, 10)]
+        self.food = None
+        self.rng = random.Random()
+        self.seed = seed
+        self.score = 0
+        self.food_eaten = 0
+        self.ticks = 0
+        self.snake_speed = 300
+        self.snake_speed_increments = 10
+        self.max_snake_speed = 50
+        self.done = False
+        # Reason the run ended: "Body", "Wall" or "Victory"
+        self.outcome = None
+        self.reset(seed)
+
+    def set_mode(self, mode):
+        self.mode = mode
+        # Portal mode allows snake to travel through walls
+        self.snake.allow_loop_around = mode == "Portal"
+
+    def reset(self, seed=None):
+        self.seed = seed
+        self.rng.seed(seed)
+        self.score = 0
+        self.food_eaten = 0
+        self.ticks = 0
+        self.snake_speed = 300
+        self.done = False
+        self.outcome = None
+        self.snake.reset()
+        self.set_mode(self.mode)
+        self.food = self.food_items[0]
+        self.food.change_position(self.rng)
+        return self.get_state()
+
+    # Action is a direction tuple, None keeps the current direction
+    def step(self, action=None):
+        if self.done:
+            return self.get_state(), 0, True
+
+        if action is not None:
+            self.snake.change_direction(action)
+        self.snake.move()
+        self.ticks += 1
+
+        reward = 0
+        if self.snake.collided:
+            self.end("Body")
+        elif self.mode == "Wall" and self.snake.grid.is_wall(self.snake.head):
+            self.end("Wall")
+        elif self.snake.head == self.food.cell:
+            reward = self.eat()
+        return self.get_state(), reward, self.done
+
+    def eat(self):
+        value = self.food.value
+        self.snake.add_segment()
+        # Make sure that snake speed doesn't exceed maximum at any time
+        if self.snake_speed > self.max_snake_speed:
+            self.snake_speed -= self.snake_speed_increments
+        self.score += value
+        self.food_eaten += 1
+        self.change_food()
+        return value
+
+    def change_food(self):
+        # Change currently displayed food based on number of food items eaten so far
+        if self.food_eaten % 10 == 0:
+            self.food = self.food_items[2]
+        elif self.food_eaten % 5 == 0:
+            self.food = self.food_items[1]
+        else:
+            self.food = self.food_items[0]
+
+        # Snake covers the whole board when there is nowhere left to place food
+        if not self.food.change_position(self.rng):
+            self.end("Victory")
+
+    def end(self, outcome):
+        self.done = True
+        self.outcome = outcome
+
+    def get_state(self):
+        return {
+            "mode": self.mode,
+            "width": self.width,
+            "height": self.height,
+            "head": self.snake.head,
+            "direction": self.snake.direction,
+            "length": len(self.snake.body) + 1,
+            "food": self.food.cell,
+            "food_value": self.food.value,
+            "score": self.score,
+            "ticks": self.ticks,
+            "outcome": self.outcome,
+            # Shared occupancy grid, indexed by packed cell
+            "grid": self.snake.grid.cells,
+        }
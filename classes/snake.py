@@ -1,96 +1,71 @@
-import pygame
-from pygame import Vector2
+from collections import deque
+from classes.occupancy_grid import OccupancyGrid
 from constants.constants import (
     CELL_NUM_X,
     CELL_NUM_Y,
-    CELL_SIZE,
-    DARK_COLOR,
-    LIGHT_COLOR,
+    BODY_CELL,
+    WALL_CELL,
 )
 
 
 class Snake:
-    def __init__(self, length, pos):
-        self.head = pygame.sprite.GroupSingle()
-        self.body = pygame.sprite.Group()
+    def __init__(self, length, pos, width=CELL_NUM_X, height=CELL_NUM_Y):
+        # Only packed cell indices are stored, drawing is left to the screen
+        self.head = None
+        self.body = deque()
         self.length = length
         self.pos = pos
-        self.tail_pos = None
-        self.direction = Vector2(1, 0)
-        self.allow_direction_change = True
+        self.tail = None
+        self.direction = (1, 0)
         self.allow_loop_around = True
+        self.grid = OccupancyGrid(width, height)
+        # Head ran into its own body at some point since last reset
+        self.collided = False
         self.create(length)
 
-    def draw(self, surface):
-        self.head.draw(surface)
-        self.body.draw(surface)
+    # Ignore turning straight back into the body
+    def change_direction(self, direction):
+        if direction != (-self.direction[0], -self.direction[1]):
+            self.direction = direction
 
+    # Move only pushes a new head and pops the tail, so cost does not depend on length
     def move(self):
-        prev_pos = self.head.sprite.pos.copy()
-        self.head.sprite.pos += self.direction
+        x, y = self.grid.unpack(self.head)
+        x += self.direction[0]
+        y += self.direction[1]
         # Check boundries only for head since the rest of segments follow
         if self.allow_loop_around:
-            if self.head.sprite.pos.x < 1:
-                self.head.sprite.pos.x = CELL_NUM_X - 2
-            if self.head.sprite.pos.x > CELL_NUM_X - 2:
-                self.head.sprite.pos.x = 1
-            if self.head.sprite.pos.y < 3:
-                self.head.sprite.pos.y = CELL_NUM_Y - 2
-            if self.head.sprite.pos.y > CELL_NUM_Y - 2:
-                self.head.sprite.pos.y = 3
+            x, y = self.grid.wrap(x, y)
 
-        self.head.sprite.rect.topleft = (
-            self.head.sprite.pos.x * CELL_SIZE,
-            self.head.sprite.pos.y * CELL_SIZE,
-        )
-
-        for segment in self.body:
-            temp_pos = segment.pos.copy()
-            segment.pos = prev_pos
-            prev_pos = temp_pos
-            segment.rect.topleft = (
-                segment.pos.x * CELL_SIZE,
-                segment.pos.y * CELL_SIZE,
-            )
-
-        self.tail_pos = temp_pos
-        self.allow_direction_change = True
+        self.body.appendleft(self.head)
+        self.tail = self.body.pop()
+        self.grid.clear(self.tail, BODY_CELL)
+        self.head = self.grid.pack(x, y)
+        # Grid is checked before the head takes the cell, walls are never overwritten
+        content = self.grid.get(self.head)
+        if content == BODY_CELL:
+            self.collided = True
+        elif content != WALL_CELL:
+            self.grid.set(self.head, BODY_CELL)
 
     def create(self, length):
-        for i in range(length):
-            x = self.pos[0] - i
-            y = self.pos[1]
-            segment = Segment((x, y))
-            if i == 0:
-                segment.subsurface.fill(DARK_COLOR)
-                self.head.add(segment)
-            else:
-                self.body.add(segment)
+        self.head = self.grid.pack(self.pos[0], self.pos[1])
+        self.grid.set(self.head, BODY_CELL)
+        for i in range(1, length):
+            cell = self.grid.pack(self.pos[0] - i, self.pos[1])
+            self.body.append(cell)
+            self.grid.set(cell, BODY_CELL)
 
+    # Growing keeps the tail that was just vacated instead of creating a new segment
     def add_segment(self):
-        segment = Segment(self.tail_pos)
-        self.body.add(segment)
+        self.body.append(self.tail)
+        self.grid.set(self.tail, BODY_CELL)
 
     def reset(self):
-        self.head.empty()
-        self.body.empty()
-        self.tail_pos = None
-        self.direction = Vector2(1, 0)
-        self.allow_direction_change = True
-        self.allow_loop_around = True
+        self.head = None
+        self.body.clear()
+        self.tail = None
+        self.direction = (1, 0)
+        self.grid.reset()
+        self.collided = False
         self.create(self.length)
-
-
-class Segment(pygame.sprite.Sprite):
-    def __init__(self, pos):
-        super().__init__()
-        self.pos = Vector2(pos[0], pos[1])
-        self.image = pygame.Surface((CELL_SIZE, CELL_SIZE))
-        self.image.fill(DARK_COLOR)
-        self.subsurface = self.image.subsurface(
-            pygame.Rect(1, 1, CELL_SIZE - 2, CELL_SIZE - 2)
-        )
-        self.subsurface.fill(LIGHT_COLOR)
-        self.rect = self.image.get_rect(
-            topleft=(self.pos.x * CELL_SIZE, self.pos.y * CELL_SIZE)
-        )
@@ -0,0 +1,47 @@
+import pygame
+from constants.constants import (
+    CELL_SIZE,
+    DARK_COLOR,
+    MEDIUM_COLOR,
+    LIGHT_COLOR,
+)
+
+
+class SpriteAtlas:
+    """Shared cell tiles referenced by every snake segment and food item"""
+
+    def __init__(self):
+        self.tiles = {}
+
+    def get(self, name):
+        if not self.tiles:
+            self.create_tiles()
+        return self.tiles[name]
+
+    def create_tiles(self):
+        self.tiles["head"] = self.create_tile(DARK_COLOR, DARK_COLOR)
+        self.tiles["body"] = self.create_tile(DARK_COLOR, LIGHT_COLOR)
+        self.tiles["rival_head"] = self.create_tile(DARK_COLOR, MEDIUM_COLOR)
+        # Modify the looks depending on food value
+        self.tiles["food_1"] = self.create_tile(DARK_COLOR, LIGHT_COLOR, MEDIUM_COLOR)
+        self.tiles["food_5"] = self.create_tile(DARK_COLOR, LIGHT_COLOR, DARK_COLOR)
+        self.tiles["food_10"] = self.create_tile(MEDIUM_COLOR, DARK_COLOR, LIGHT_COLOR)
+
+    def create_tile(self, border_color, fill_color, square_color=None):
+        tile = pygame.Surface((CELL_SIZE, CELL_SIZE))
+        tile.fill(border_color)
+        tile.fill(fill_color, pygame.Rect(1, 1, CELL_SIZE - 2, CELL_SIZE - 2))
+        if square_color is not None:
+            size = CELL_SIZE // 5
+            position = CELL_SIZE // 2 - size // 2
+            tile.fill(square_color, pygame.Rect(position, position, size, size))
+        # Match display pixel format so that blits don't need conversion
+        if pygame.display.get_surface() is not None:
+            tile = tile.convert()
+        return tile
+
+    def clear(self):
+        self.tiles.clear()
+
+
+sprite_atlas = SpriteAtlas()
@@ -0,0 +1,35 @@
+from contextlib import contextmanager
+import time
+
+
+class StartupReport:
+    """Time spent in each startup phase up to the first presented frame"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.start_time = time.perf_counter()
+        self.phases = []
+        self.first_frame_time = None
+
+    @contextmanager
+    def measure(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def first_frame(self):
+        if self.first_frame_time is not None:
+            return
+        self.first_frame_time = time.perf_counter() - self.start_time
+        if self.enabled:
+            print(self.format())
+
+    def format(self):
+        phases = list(self.phases)
+        if self.first_frame_time is not None:
+            phases.append(("Time to first frame", self.first_frame_time))
+        return "\n".join(
+            f"{name:<28}{seconds * 1000:>9.1f} ms" for name, seconds in phases
+        )
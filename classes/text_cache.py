@@ -0,0 +1,59 @@
+from collections import OrderedDict
+import pygame
+
+
+class FontRegistry:
+    """Loads every (font path, size) pair only once"""
+
+    def __init__(self):
+        self.fonts = {}
+
+    def get(self, font, font_size):
+        key = (font, font_size)
+        if key not in self.fonts:
+            self.fonts[key] = pygame.font.Font(font, font_size)
+        return self.fonts[key]
+
+    def clear(self):
+        self.fonts.clear()
+
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces"""
+
+    def __init__(self, font_registry, max_size):
+        self.font_registry = font_registry
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, font, font_size, color):
+        key = (text, font, font_size, tuple(color))
+        text_surface = self.surfaces.get(key)
+        if text_surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return text_surface
+
+        self.misses += 1
+        text_font = self.font_registry.get(font, font_size)
+        # Don't see much of a difference, so keeping AA off
+        text_surface = text_font.render(text, False, color)
+        self.surfaces[key] = text_surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return text_surface
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.surfaces),
+            "max_size": self.max_size,
+        }
+
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,127 @@
+from datetime import datetime
+import json
+import os
+import random
+from multiprocessing import Pool
+from classes.autopilot import get_policy
+from classes.simulation import Simulation
+
+
+# Runs in worker processes, so it has to stay a module level function
+def play_game(task):
+    policy_name, mode, seed, max_ticks = task
+    policy = get_policy(policy_name)
+    # Policy gets its own stream, so it can't follow or predict food placement
+    rng = random.Random(f"policy-{seed}")
+    simulation = Simulation(mode)
+    state = simulation.reset(seed)
+    done = False
+    while not done and simulation.ticks < max_ticks:
+        state, _, done = simulation.step(policy(state, rng))
+
+    return {
+        "policy": policy_name,
+        "mode": mode,
+        "seed": seed,
+        "score": state["score"],
+        "length": state["length"],
+        "ticks": state["ticks"],
+        "outcome": state["outcome"] or "Timeout",
+    }
+
+
+class Tournament:
+    """Plays seeded headless games for every policy across a process pool"""
+
+    def __init__(self, policies, modes, games, max_ticks, processes=None, seed=0):
+        self.policies = policies
+        self.modes = modes
+        self.games = games
+        self.max_ticks = max_ticks
+        self.processes = processes or os.cpu_count()
+        self.seed = seed
+        self.results = []
+
+    def get_tasks(self):
+        # Every policy plays the same seeds so that results are comparable
+        return [
+            (policy, mode, self.seed + i, self.max_ticks)
+            for policy in self.policies
+            for mode in self.modes
+            for i in range(self.games)
+        ]
+
+    def run(self):
+        tasks = self.get_tasks()
+        chunksize = max(1, len(tasks) // (self.processes * 4))
+        with Pool(self.processes) as pool:
+            self.results = list(pool.imap_unordered(play_game, tasks, chunksize))
+        self.results.sort(key=lambda x: (x["policy"], x["mode"], x["seed"]))
+        return self.results
+
+    def get_summary(self):
+        summary = []
+        for policy in self.policies:
+            for mode in self.modes:
+                results = [
+                    result
+                    for result in self.results
+                    if result["policy"] == policy and result["mode"] == mode
+                ]
+                if not results:
+                    continue
+                count = len(results)
+                outcomes = {}
+                for result in results:
+                    outcomes[result["outcome"]] = outcomes.get(result["outcome"], 0) + 1
+                summary.append(
+                    {
+                        "policy": policy,
+                        "mode": mode,
+                        "games": count,
+                        "mean_score": sum(r["score"] for r in results) / count,
+                        "max_score": max(r["score"] for r in results),
+                        "mean_length": sum(r["length"] for r in results) / count,
+                        "mean_ticks": sum(r["ticks"] for r in results) / count,
+                        "outcomes": outcomes,
+                    }
+                )
+        return summary
+
+    def format_summary(self):
+        header = (
+            f"{'Policy':<20}{'Mode':<8}{'Games':>7}{'Mean':>9}{'Max':>7}"
+            f"{'Length':>9}{'Ticks':>10}  Outcomes"
+        )
+        lines = [header, "-" * len(header)]
+        for row in self.get_summary():
+            outcomes = ", ".join(
+                f"{outcome}: {count}"
+                for outcome, count in sorted(row["outcomes"].items())
+            )
+            lines.append(
+                f"{row['policy']:<20}{row['mode']:<8}{row['games']:>7}"
+                f"{row['mean_score']:>9.1f}{row['max_score']:>7}"
+                f"{row['mean_length']:>9.1f}{row['mean_ticks']:>10.1f}  {outcomes}"
+            )
+        return "\n".join(lines)
+
+    # Same layout as leaderboards folder: a top 10 file per mode, plus full results
+    def save(self, folder):
+        os.makedirs(folder, exist_ok=True)
+        date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for mode in self.modes:
+            data = [
+                {"name": result["policy"], "score": result["score"], "date": date}
+                for result in self.results
+                if result["mode"] == mode
+            ]
+            data.sort(key=lambda x: x["score"], reverse=True)
+            path = os.path.join(folder, f"{mode.lower()}_leaderboards.json")
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(data[:10], file, indent=4)
+
+        with open(os.path.join(folder, "summary.json"), "w", encoding="utf-8") as file:
+            json.dump(self.get_summary(), file, indent=4)
+        with open(os.path.join(folder, "games.json"), "w", encoding="utf-8") as file:
+            json.dump(self.results, file, indent=4)
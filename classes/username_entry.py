@@ -0,0 +1,107 @@
+import pygame
+from utils.utils import draw_text, draw_border
+from constants.constants import (
+    DARK_COLOR,
+    BRIGHT_COLOR,
+    FONT,
+    SMALL_FONT,
+    MEDIUM_FONT,
+)
+
+
+class UsernameEntry:
+    """Username input after game over, redrawn only when its text changes"""
+
+    def __init__(self, surface, rect, file_handler, state_manager, renderer, in_game):
+        self.surface = surface
+        self.rect = rect
+        self.file_handler = file_handler
+        self.state_manager = state_manager
+        self.renderer = renderer
+        self.in_game = in_game
+        self.frame = pygame.Surface((self.rect.width // 1.5, self.rect.height // 4))
+        self.frame_rect = self.frame.get_rect(center=self.rect.center)
+        self.message_text = "Enter your username"
+        self.input_text = ""
+        self.drawn_view_state = None
+        self.presented = False
+        self.full_redraw = True
+
+    def draw(self):
+        # Game over frame under the box is gone once something else drew over it,
+        # e.g. the frame overlay, so it's drawn and tinted again
+        if self.full_redraw:
+            self.in_game.draw()
+            self.in_game.tint()
+            self.full_redraw = False
+            self.presented = False
+        view_state = (self.message_text, self.input_text)
+        if view_state != self.drawn_view_state:
+            self.compose()
+            self.drawn_view_state = view_state
+            self.presented = False
+        # Box is drawn over the last game frame, so only its area is presented
+        if not self.presented:
+            self.surface.blit(self.frame, self.frame_rect)
+            self.renderer.mark_rect(self.frame_rect)
+            self.presented = True
+
+    def compose(self):
+        self.frame.fill(BRIGHT_COLOR)
+        width, height = self.frame_rect.size
+        draw_border(self.frame, (0, 0), width, height, DARK_COLOR, 2)
+        draw_text(
+            self.frame,
+            (self.frame_rect.width // 2, SMALL_FONT),
+            self.message_text,
+            FONT,
+            SMALL_FONT,
+            DARK_COLOR,
+        )
+        draw_text(
+            self.frame,
+            (self.frame_rect.width // 2, self.frame_rect.height // 2),
+            self.input_text + "_" if len(self.input_text) < 16 else self.input_text,
+            FONT,
+            MEDIUM_FONT,
+            DARK_COLOR,
+        )
+        draw_text(
+            self.frame,
+            (self.frame_rect.width // 2, self.frame_rect.height - SMALL_FONT),
+            "Press ENTER to continue",
+            FONT,
+            SMALL_FONT,
+            DARK_COLOR,
+        )
+
+    def show(self):
+        self.full_redraw = True
+
+    def handle_events(self, event):
+        if event.type == pygame.KEYDOWN:
+            length = len(self.input_text)
+            if event.key == pygame.K_RETURN:
+                if length < 3:
+                    self.message_text = "A minimum of 3 characters are required"
+                elif not self.input_text.isalnum():
+                    self.message_text = "Only alphanumeric characters are allowed"
+                else:
+                    self.submit()
+            elif event.key == pygame.K_BACKSPACE:
+                self.input_text = self.input_text[:-1]
+            else:
+                if length < 16:
+                    self.input_text += event.unicode
+
+    # Score is written in the background, so returning to menu never waits on disk
+    def submit(self):
+        simulation = self.in_game.simulation
+        recorder = self.in_game.recorder
+        recorder.score = simulation.score
+        self.file_handler.submit_entry(
+            self.in_game.mode, self.input_text, simulation.score, recorder
+        )
+        self.message_text = "Enter your username"
+        self.input_text = ""
+        self.in_game.finish()
@@ -1,13 +1,38 @@
-from pygame import USEREVENT
-
 GAME_NAME = "Python"
 FPS = 60
 CELL_NUM_X = 32
 CELL_NUM_Y = 18
-CELL_SIZE = 25
+# Low resolution mode draws at a few pixels per cell and lets SDL scale the
+# frame up to the window, so flat blocks cost far less fill and blit work
+LOW_RESOLUTION_RENDERING = False
+LOW_RESOLUTION_CELL_SIZE = 10
+CELL_SIZE = LOW_RESOLUTION_CELL_SIZE if LOW_RESOLUTION_RENDERING else 25
 DISPLAY_WIDTH = CELL_NUM_X * CELL_SIZE
 DISPLAY_HEIGHT = CELL_NUM_Y * CELL_SIZE
-DISPLAY_UPDATE = USEREVENT + 1
+DIRTY_RECT_RENDERING = True
+# Build screens that weren't entered yet during idle frames
+PRELOAD_SCREENS = True
+# Simulation ticks run on a fixed timestep independent from FPS
+MAX_CATCH_UP_TICKS = 5
+INTERPOLATED_RENDERING = False
+INPUT_QUEUE_SIZE = 2
+FRAME_OVERLAY_REFRESH_MS = 250
+# Boards larger than the display scroll, camera keeps snake head this many
+# cells away from the viewport edge
+CAMERA_MARGIN = 5
+MAX_BOARD_SIZE = 4096
+# Boards up to this many cells keep an index of empty cells, larger ones pick
+# empty cells by sampling and only build the index once sampling keeps missing
+FREE_INDEX_MAX_CELLS = 1 << 16
+FREE_CELL_SAMPLES = 32
+# Board background is pre-rendered in square chunks of this many cells
+CHUNK_SIZE = 8
+CHUNK_CACHE_SIZE = 64
+# Arena mode: many AI snakes share one large board
+ARENA_SIZE = (160, 100)
+ARENA_SNAKES = 200
+ARENA_FOOD = 300
+ARENA_TICK_MS = 120
 
 # Colors
 DARK_COLOR = (15, 56, 15)  # 0f380f
@@ -16,5 +41,16 @@ LIGHT_COLOR = (139, 172, 15)  # 8bac0f
 BRIGHT_COLOR = (155, 188, 15)  # 9bbc0f
 
 FONT = "fonts/Silkscreen-Regular.ttf"
-SMALL_FONT = int(CELL_SIZE // 1.5)
+# Pixel font stops being legible below 8 px
+SMALL_FONT = max(int(CELL_SIZE // 1.5), 8)
 MEDIUM_FONT = CELL_SIZE
+TEXT_CACHE_SIZE = 256
+
+# Time in ms for music to fade between tracks
+MUSIC_FADE_MS = 1000
+
+# Occupancy grid cell contents
+EMPTY_CELL = 0
+BODY_CELL = 1
+WALL_CELL = 2
+FOOD_CELL = 3
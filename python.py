@@ -1,8 +1,64 @@
-from classes.game import Game
+import argparse
+import logging
+from classes.startup_report import StartupReport
+from constants.constants import CELL_NUM_X, CELL_NUM_Y, MAX_BOARD_SIZE
+
+
+def board_size(value):
+    try:
+        width, height = (int(size) for size in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected WIDTHxHEIGHT, e.g. 200x120")
+    if not (CELL_NUM_X <= width <= MAX_BOARD_SIZE):
+        raise argparse.ArgumentTypeError(
+            f"width has to be between {CELL_NUM_X} and {MAX_BOARD_SIZE}"
+        )
+    if not (CELL_NUM_Y <= height <= MAX_BOARD_SIZE):
+        raise argparse.ArgumentTypeError(
+            f"height has to be between {CELL_NUM_Y} and {MAX_BOARD_SIZE}"
+        )
+    return (width, height)
 
 
 def main():
-    game = Game()
+    parser = argparse.ArgumentParser(description="A classic game of snake")
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="print time spent in each startup phase once first frame is shown",
+    )
+    parser.add_argument(
+        "--board",
+        type=board_size,
+        default=(CELL_NUM_X, CELL_NUM_Y),
+        help="board size in cells as WIDTHxHEIGHT, larger boards scroll",
+    )
+    parser.add_argument(
+        "--frame-stats",
+        metavar="PATH",
+        help="save frame time histograms per state on quit, CSV for .csv, else JSON",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="WARNING",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="INFO also logs input latency percentiles at the end of every run",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=args.log_level, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    startup_report = StartupReport(args.startup_report)
+
+    # Imported here so that the report includes loading pygame and game modules
+    with startup_report.measure("Imports"):
+        from classes.game import Game
+
+    game = Game(
+        startup_report=startup_report,
+        board_size=args.board,
+        frame_stats=args.frame_stats,
+    )
     game.start()
 
 
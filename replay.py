@@ -0,0 +1,55 @@
+import argparse
+import sys
+from classes.replay import Replay
+
+# Fixed timestep runs at most 5 ticks per frame, at 60 FPS and the fastest 50 ms
+# ticks that is 15 times real time, faster playback would only drop time
+MAX_PLAYBACK_SPEED = 15
+
+
+def playback_speed(value):
+    try:
+        speed = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected a number, e.g. 4")
+    if not (0 < speed <= MAX_PLAYBACK_SPEED):
+        raise argparse.ArgumentTypeError(
+            f"speed has to be above 0 and at most {MAX_PLAYBACK_SPEED}"
+        )
+    return speed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch or verify a recorded run")
+    parser.add_argument("path")
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="replay uncapped without a window and verify recorded score",
+    )
+    parser.add_argument(
+        "--speed",
+        type=playback_speed,
+        default=1,
+        help=f"watch at this many times real time, up to {MAX_PLAYBACK_SPEED}",
+    )
+    args = parser.parse_args()
+    replay = Replay.load(args.path)
+
+    if args.fast:
+        simulation = replay.verify()
+        print(
+            f"Mode: {replay.mode}, seed: {replay.seed}, ticks: {simulation.ticks}, "
+            f"score: {simulation.score} (recorded {replay.score})"
+        )
+        sys.exit(0 if simulation.score == replay.score else 1)
+
+    # Imported here so that verification never needs pygame
+    from classes.game import Game
+
+    game = Game(replay, replay_speed=args.speed)
+    game.start()
+
+
+if __name__ == "__main__":
+    main()
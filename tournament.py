@@ -0,0 +1,40 @@
+import argparse
+import os
+import time
+from classes.tournament import Tournament
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score autopilot policies headless")
+    parser.add_argument("--policies", nargs="+", default=["greedy", "random"])
+    parser.add_argument("--modes", nargs="+", default=["Portal", "Wall"])
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--max-ticks", type=int, default=20000)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", default=os.path.join("leaderboards", "tournament")
+    )
+    args = parser.parse_args()
+
+    tournament = Tournament(
+        args.policies,
+        args.modes,
+        args.games,
+        args.max_ticks,
+        args.processes,
+        args.seed,
+    )
+    start = time.perf_counter()
+    results = tournament.run()
+    elapsed = time.perf_counter() - start
+    print(tournament.format_summary())
+    print(
+        f"\n{len(results)} games on {tournament.processes} processes "
+        f"in {elapsed:.2f}s ({len(results) / elapsed:.1f} games/s)"
+    )
+    tournament.save(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
 import pygame
+from classes.text_cache import FontRegistry, TextCache
+from constants.constants import TEXT_CACHE_SIZE
+
+font_registry = FontRegistry()
+text_cache = TextCache(font_registry, TEXT_CACHE_SIZE)
 
 
 def draw_text(surface, pos, text, font, font_size, color):
-    text_font = pygame.font.Font(font, font_size)
-    # Don't see much of a difference, so keeping AA off
-    text_surface = text_font.render(text, False, color)
+    text_surface = text_cache.render(text, font, font_size, color)
     text_rect = text_surface.get_rect(center=pos)
     surface.blit(text_surface, text_rect)
 